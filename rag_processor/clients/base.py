@@ -93,6 +93,16 @@ class ClientConfig(ABC):
             "description": self.description,
         }
     
+    @property
+    def lazy_metadata(self) -> bool:
+        """
+        Whether strategies may defer building chunk metadata until it is read.
+        
+        Returns:
+            bool: True to allow lazy metadata (default: eager)
+        """
+        return False
+    
     def customize_strategy_config(self, strategy_name: str) -> Dict[str, Any]:
         """
         Provide client-specific strategy customizations.
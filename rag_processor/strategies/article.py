@@ -6,15 +6,99 @@ that preserves paragraph structure and narrative flow.
 """
 
 import re
-from typing import List, Dict, Any
+from functools import partial
+from typing import List, Dict, Any, Tuple
 
 from .base import ProcessingStrategy
 from ..utils.directive_parser import ProcessingDirective
-from ..utils.text_utils import ChunkMetadata, TextChunker
+from ..utils.text_utils import ChunkMetadata, TextChunker, strip_span
 from ..clients.base import ClientConfig
 from config.constants import ARTICLE_CHUNK_OVERLAP
 
 
+_PARAGRAPH_SEPARATOR_RE = re.compile(r'\n\s*\n')
+_SENTENCE_BOUNDARY_RE = re.compile(r'([.!?]+)\s*')
+_SENTENCE_TERMINATOR_RE = re.compile(r'[.!?]+')
+
+# Sentence aggregation limits (characters)
+_TARGET_CHUNK_SIZE = 1000  # Target size in characters
+_MAX_CHUNK_SIZE = 1500     # Maximum size before forced split
+_MIN_FLUSH_SIZE = 500      # Minimum size before flushing at the target
+
+# Example content appended after the template header
+_TEMPLATE_BODY = """
+# Article Template
+
+## Introduction
+
+This is the introduction paragraph of your article. It should provide context and overview of the topic you'll be discussing. The introduction sets the tone and gives readers an idea of what to expect.
+
+## Main Content
+
+Here you can develop your main ideas. Each paragraph should focus on a specific point or aspect of your topic. Use clear, concise sentences that flow naturally from one to the next.
+
+For example, you might want to explain a concept in detail. Then you could provide evidence or examples to support your points. This creates a logical progression that readers can easily follow.
+
+## Supporting Details
+
+Add supporting information, examples, or case studies here. This section can include:
+
+- Bullet points for key information
+- Numbered lists for sequential processes
+- Quotes or references to other sources
+- Statistical data or research findings
+
+## Conclusion
+
+Summarize the main points of your article and provide any final thoughts or recommendations. The conclusion should tie everything together and leave readers with a clear understanding of the topic.
+
+# Continue adding content following proper article structure with clear paragraphs and sentences."""
+
+
+def _plan_sentence_chunks(lengths: List[int], overlap: int) -> List[Tuple[int, int]]:
+    """
+    Group consecutive sentences into chunks by size.
+    
+    Works on sentence lengths only, so the sizing loop never touches the
+    sentence dicts or the text itself.
+    
+    Args:
+        lengths (List[int]): Length of each sentence in document order
+        overlap (int): Character overlap carried into the next chunk
+        
+    Returns:
+        List[Tuple[int, int]]: (start, end) sentence index range of each chunk
+    """
+    ranges = []
+    start = 0
+    size = 0
+    
+    for index, length in enumerate(lengths):
+        # Close the chunk if we have content and adding this sentence hits limits
+        if index > start and (
+            size + length > _MAX_CHUNK_SIZE
+            or (size + length > _TARGET_CHUNK_SIZE and size > _MIN_FLUSH_SIZE)
+        ):
+            ranges.append((start, index))
+            
+            # Start new chunk with the trailing sentences that fit the overlap
+            carried = 0
+            new_start = index
+            while new_start > start and carried + lengths[new_start - 1] <= overlap:
+                new_start -= 1
+                carried += lengths[new_start]
+            start = new_start
+            size = carried
+        
+        size += length
+    
+    # Add final chunk if there's remaining content
+    if start < len(lengths):
+        ranges.append((start, len(lengths)))
+    
+    return ranges
+
+
 class ArticleStrategy(ProcessingStrategy):
     """
     Article processing strategy.
@@ -23,25 +107,10 @@ class ArticleStrategy(ProcessingStrategy):
     and maintaining narrative flow with appropriate overlap.
     """
     
-    @property
-    def name(self) -> str:
-        """Strategy name in format 'category/method'."""
-        return "article/sentence-based"
-    
-    @property
-    def description(self) -> str:
-        """Human-readable description of the strategy."""
-        return "Article chunking at sentence boundaries with paragraph structure preservation"
-    
-    @property
-    def default_chunk_pattern(self) -> str:
-        """Default regex pattern for sentence boundaries."""
-        return r'[.!?]+\s+'
-    
-    @property
-    def default_overlap(self) -> int:
-        """Default character overlap between chunks."""
-        return ARTICLE_CHUNK_OVERLAP
+    name = "article/sentence-based"
+    description = "Article chunking at sentence boundaries with paragraph structure preservation"
+    default_chunk_pattern = r'[.!?]+\s+'
+    default_overlap = ARTICLE_CHUNK_OVERLAP
     
     def process(
         self, 
@@ -85,13 +154,13 @@ class ArticleStrategy(ProcessingStrategy):
         """
         issues = []
         
-        # Check sentence structure
-        sentence_count = len(re.findall(r'[.!?]+', content))
+        # Check sentence structure (runs of terminators, so "..." counts once)
+        sentence_count = len(_SENTENCE_TERMINATOR_RE.findall(content))
         if sentence_count < 10:
             issues.append("Very few sentences detected - may not be suitable for sentence-based chunking")
         
         # Check paragraph structure
-        paragraph_count = len(re.split(r'\n\s*\n', content))
+        paragraph_count = len(_PARAGRAPH_SEPARATOR_RE.findall(content)) + 1
         if paragraph_count < 3:
             issues.append("Very few paragraphs detected - content may be too short")
         
@@ -149,38 +218,9 @@ class ArticleStrategy(ProcessingStrategy):
         if custom_rules:
             template_parts.append(f"#!custom-rules: {json.dumps(custom_rules, separators=(',', ':'))}")
         
-        # Add example content
-        template_parts.extend([
-            "",
-            "# Article Template",
-            "",
-            "## Introduction",
-            "",
-            "This is the introduction paragraph of your article. It should provide context and overview of the topic you'll be discussing. The introduction sets the tone and gives readers an idea of what to expect.",
-            "",
-            "## Main Content",
-            "",
-            "Here you can develop your main ideas. Each paragraph should focus on a specific point or aspect of your topic. Use clear, concise sentences that flow naturally from one to the next.",
-            "",
-            "For example, you might want to explain a concept in detail. Then you could provide evidence or examples to support your points. This creates a logical progression that readers can easily follow.",
-            "",
-            "## Supporting Details",
-            "",
-            "Add supporting information, examples, or case studies here. This section can include:",
-            "",
-            "- Bullet points for key information",
-            "- Numbered lists for sequential processes",
-            "- Quotes or references to other sources",
-            "- Statistical data or research findings",
-            "",
-            "## Conclusion",
-            "",
-            "Summarize the main points of your article and provide any final thoughts or recommendations. The conclusion should tie everything together and leave readers with a clear understanding of the topic.",
-            "",
-            "# Continue adding content following proper article structure with clear paragraphs and sentences.",
-        ])
-        
-        return '\n'.join(template_parts)
+        # Append the static example content
+        header = '\n'.join(template_parts)
+        return f"{header}\n{_TEMPLATE_BODY}"
     
     def _chunk_by_sentences(self, content: str, overlap: int, client_config: ClientConfig) -> List[ChunkMetadata]:
         """
@@ -202,121 +242,128 @@ class ArticleStrategy(ProcessingStrategy):
         if not sentences:
             return chunks
         
-        current_chunk_sentences = []
-        current_chunk_size = 0
-        target_chunk_size = 1000  # Target size in characters
-        max_chunk_size = 1500     # Maximum size before forced split
+        lengths = [s["end"] - s["start"] for s in sentences]
+        ranges = _plan_sentence_chunks(lengths, overlap)
+        last_index = len(ranges) - 1
         
-        for sentence_data in sentences:
-            sentence_text = sentence_data["text"]
-            sentence_size = len(sentence_text)
-            
-            # Check if adding this sentence would exceed limits
-            would_exceed_target = current_chunk_size + sentence_size > target_chunk_size
-            would_exceed_max = current_chunk_size + sentence_size > max_chunk_size
-            
-            # Create chunk if we have content and hit limits
-            if current_chunk_sentences and (would_exceed_max or (would_exceed_target and current_chunk_size > 500)):
-                chunk = self._create_sentence_chunk(
-                    current_chunk_sentences, 
-                    len(chunks), 
-                    overlap if chunks else 0
-                )
-                chunks.append(chunk)
-                
-                # Start new chunk with overlap sentences if needed
-                if overlap > 0:
-                    overlap_sentences = self._get_overlap_sentences(current_chunk_sentences, overlap)
-                    current_chunk_sentences = overlap_sentences
-                    current_chunk_size = sum(len(s["text"]) for s in overlap_sentences)
-                else:
-                    current_chunk_sentences = []
-                    current_chunk_size = 0
-            
-            # Add current sentence
-            current_chunk_sentences.append(sentence_data)
-            current_chunk_size += sentence_size
-        
-        # Add final chunk if there's remaining content
-        if current_chunk_sentences:
+        for chunk_index, (start, end) in enumerate(ranges):
             chunk = self._create_sentence_chunk(
-                current_chunk_sentences,
-                len(chunks),
-                0  # No overlap for final chunk
+                content,
+                sentences[start:end],
+                chunk_index,
+                # No overlap for the first or final chunk
+                overlap if 0 < chunk_index < last_index else 0,
+                lazy_metadata=client_config.lazy_metadata
             )
             chunks.append(chunk)
         
         return chunks
     
     def _extract_sentences_with_boundaries(self, content: str) -> List[Dict[str, Any]]:
-        """Extract sentences with paragraph boundary information."""
-        sentences = []
+        """
+        Extract sentence spans with paragraph boundary information.
         
-        # Split into paragraphs first
-        paragraphs = re.split(r'\n\s*\n', content)
-        position = 0
+        Sentences are recorded as (start, end) offsets into the content with
+        surrounding whitespace excluded; the text itself is only sliced out
+        when a chunk is built.
+        """
+        sentences = []
         
-        for para_idx, paragraph in enumerate(paragraphs):
-            if not paragraph.strip():
+        # Split into paragraphs first, tracking their offsets
+        paragraph_spans = []
+        previous_end = 0
+        for separator in _PARAGRAPH_SEPARATOR_RE.finditer(content):
+            paragraph_spans.append((previous_end, separator.start()))
+            previous_end = separator.end()
+        paragraph_spans.append((previous_end, len(content)))
+        
+        for para_idx, (para_start, para_end) in enumerate(paragraph_spans):
+            text_start, text_end = strip_span(content, para_start, para_end)
+            if text_start == text_end:
                 continue
             
-            # Find paragraph position in original content
-            para_start = content.find(paragraph.strip(), position)
-            position = para_start + len(paragraph)
-            
             # Split paragraph into sentences
-            sentence_pattern = r'([.!?]+)\s*'
-            sentence_boundaries = list(re.finditer(sentence_pattern, paragraph))
+            sentence_boundaries = _SENTENCE_BOUNDARY_RE.finditer(content, para_start, para_end)
             
-            sentence_start = 0
+            sentence_start = para_start
             for boundary in sentence_boundaries:
                 sentence_end = boundary.end()
-                sentence_text = paragraph[sentence_start:sentence_end].strip()
+                start, end = strip_span(content, sentence_start, sentence_end)
                 
-                if sentence_text:
+                if start < end:
                     sentences.append({
-                        "text": sentence_text,
+                        "start": start,
+                        "end": end,
                         "paragraph_index": para_idx,
-                        "is_paragraph_start": sentence_start == 0,
-                        "is_paragraph_end": sentence_end >= len(paragraph.strip()),
-                        "absolute_position": para_start + sentence_start,
+                        "is_paragraph_start": sentence_start == para_start,
+                        "is_paragraph_end": sentence_end - para_start >= text_end - text_start,
                     })
                 
                 sentence_start = sentence_end
             
             # Handle paragraph with no sentence boundaries
-            if not sentence_boundaries and paragraph.strip():
+            if sentence_start == para_start:
                 sentences.append({
-                    "text": paragraph.strip(),
+                    "start": text_start,
+                    "end": text_end,
                     "paragraph_index": para_idx,
                     "is_paragraph_start": True,
                     "is_paragraph_end": True,
-                    "absolute_position": para_start,
                 })
         
         return sentences
     
-    def _create_sentence_chunk(self, sentence_list: List[Dict], chunk_index: int, overlap: int) -> ChunkMetadata:
-        """Create a chunk from a list of sentences."""
+    def _create_sentence_chunk(
+        self, 
+        content: str, 
+        sentence_list: List[Dict], 
+        chunk_index: int, 
+        overlap: int,
+        lazy_metadata: bool = False
+    ) -> ChunkMetadata:
+        """Create a chunk from a list of sentence spans."""
         if not sentence_list:
             return None
         
         # Combine sentence texts
-        chunk_text = " ".join(s["text"] for s in sentence_list)
+        chunk_text = " ".join(content[s["start"]:s["end"]] for s in sentence_list)
         
         # Calculate positions
-        start_pos = sentence_list[0]["absolute_position"]
+        start_pos = sentence_list[0]["start"]
         end_pos = start_pos + len(chunk_text)
         
+        return self.create_chunk(
+            chunk_text,
+            partial(self._build_sentence_chunk_metadata, chunk_text, sentence_list, chunk_index),
+            start_pos,
+            end_pos,
+            lazy_metadata
+        )
+    
+    def _build_sentence_chunk_metadata(
+        self, 
+        chunk_text: str, 
+        sentence_list: List[Dict], 
+        chunk_index: int
+    ) -> Dict[str, Any]:
+        """Build the metadata dict for a sentence-based chunk."""
+        # Sentences are in document order, so paragraphs change monotonically
+        # and counting the transitions gives the number of distinct paragraphs
+        paragraph_count = 1
+        previous_paragraph = sentence_list[0]["paragraph_index"]
+        for sentence in sentence_list:
+            if sentence["paragraph_index"] != previous_paragraph:
+                paragraph_count += 1
+                previous_paragraph = sentence["paragraph_index"]
+        
         # Analyze chunk content
         chunk_analysis = self._analyze_chunk_content(chunk_text, sentence_list)
         
-        # Create metadata
-        chunk_metadata = {
+        return {
             "strategy": self.name,
             "chunk_index": chunk_index,
             "sentence_count": len(sentence_list),
-            "paragraph_count": len(set(s["paragraph_index"] for s in sentence_list)),
+            "paragraph_count": paragraph_count,
             "starts_paragraph": sentence_list[0]["is_paragraph_start"],
             "ends_paragraph": sentence_list[-1]["is_paragraph_end"],
             "chunking_method": "sentence-based",
@@ -325,32 +372,6 @@ class ArticleStrategy(ProcessingStrategy):
             "has_lists": chunk_analysis.get("has_lists", False),
             "readability_score": chunk_analysis.get("readability", "medium"),
         }
-        
-        return ChunkMetadata(
-            text=chunk_text,
-            metadata=chunk_metadata,
-            start_position=start_pos,
-            end_position=end_pos
-        )
-    
-    def _get_overlap_sentences(self, sentences: List[Dict], overlap_chars: int) -> List[Dict]:
-        """Get sentences for overlap based on character count."""
-        if not sentences:
-            return []
-        
-        overlap_sentences = []
-        char_count = 0
-        
-        # Work backwards from end to get overlap
-        for sentence in reversed(sentences):
-            sentence_length = len(sentence["text"])
-            if char_count + sentence_length <= overlap_chars:
-                overlap_sentences.insert(0, sentence)
-                char_count += sentence_length
-            else:
-                break
-        
-        return overlap_sentences
     
     def _analyze_chunk_content(self, chunk_text: str, sentences: List[Dict]) -> Dict[str, Any]:
         """Analyze chunk content for additional metadata."""
@@ -378,8 +399,8 @@ class ArticleStrategy(ProcessingStrategy):
             analysis["readability"] = "medium"
         
         # Check for special features
-        analysis["has_numbers"] = bool(re.search(r'\d+', chunk_text))
-        analysis["has_questions"] = bool(re.search(r'\?', chunk_text))
-        analysis["has_exclamations"] = bool(re.search(r'!', chunk_text))
+        analysis["has_numbers"] = any(map(str.isdecimal, chunk_text))
+        analysis["has_questions"] = '?' in chunk_text
+        analysis["has_exclamations"] = '!' in chunk_text
         
         return analysis
\ No newline at end of file
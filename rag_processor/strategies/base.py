@@ -6,11 +6,13 @@ for consistent document chunking and template generation.
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import List, Dict, Any, Optional, ClassVar, Callable
 from dataclasses import dataclass
 
 from ..utils.directive_parser import ProcessingDirective
-from ..utils.text_utils import ChunkMetadata
+from ..utils.text_utils import ChunkMetadata, LazyChunkMetadata
 from ..clients.base import ClientConfig
 
 
@@ -22,29 +24,28 @@ class ProcessingStrategy(ABC):
     while maintaining a consistent interface.
     """
     
-    @property
-    @abstractmethod
-    def name(self) -> str:
-        """Strategy name in format 'category/method'."""
-        pass
+    # Strategy identity and defaults; concrete strategies set these as plain
+    # class attributes (enforced in __init_subclass__)
+    name: ClassVar[str]                    # Format 'category/method'
+    description: ClassVar[str]             # Human-readable description
+    default_chunk_pattern: ClassVar[str]   # Regex pattern for chunk boundaries
+    default_overlap: ClassVar[int]         # Character overlap between chunks
     
-    @property
-    @abstractmethod
-    def description(self) -> str:
-        """Human-readable description of the strategy."""
-        pass
+    _REQUIRED_CLASS_ATTRIBUTES = ("name", "description", "default_chunk_pattern", "default_overlap")
     
-    @property
-    @abstractmethod
-    def default_chunk_pattern(self) -> str:
-        """Default regex pattern for chunk boundaries."""
-        pass
-    
-    @property
-    @abstractmethod
-    def default_overlap(self) -> int:
-        """Default character overlap between chunks."""
-        pass
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """Ensure concrete strategies define the required class attributes."""
+        super().__init_subclass__(**kwargs)
+        
+        # Abstract intermediate classes may leave these to their subclasses
+        if any(getattr(value, "__isabstractmethod__", False) for value in vars(cls).values()):
+            return
+        
+        missing = [attr for attr in cls._REQUIRED_CLASS_ATTRIBUTES if not hasattr(cls, attr)]
+        if missing:
+            raise TypeError(
+                f"{cls.__name__} must define class attribute(s): {', '.join(missing)}"
+            )
     
     @abstractmethod
     def process(
@@ -66,6 +67,37 @@ class ProcessingStrategy(ABC):
         """
         pass
     
+    def process_batch(
+        self, 
+        contents: List[str], 
+        directive: ProcessingDirective, 
+        client_config: ClientConfig,
+        workers: Optional[int] = None
+    ) -> List[List[ChunkMetadata]]:
+        """
+        Process many documents in parallel worker processes.
+        
+        Chunking is CPU-bound and pure per document, so documents are
+        spread across a process pool to sidestep the GIL. The strategy,
+        directive and client config are pickled to each worker.
+        
+        Args:
+            contents (List[str]): Raw text content of each document
+            directive (ProcessingDirective): Processing directives shared by all documents
+            client_config (ClientConfig): Client-specific configuration
+            workers (Optional[int]): Number of worker processes (default: CPU count)
+            
+        Returns:
+            List[List[ChunkMetadata]]: Chunks for each document, in input order
+        """
+        process_one = partial(self.process, directive=directive, client_config=client_config)
+        
+        if workers == 1 or len(contents) <= 1:
+            return [process_one(content) for content in contents]
+        
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(process_one, contents, chunksize=8))
+    
     @abstractmethod
     def validate_content(self, content: str, directive: ProcessingDirective) -> List[str]:
         """
@@ -144,6 +176,8 @@ class ProcessingStrategy(ABC):
             "start_position": start_pos,
             "end_position": end_pos,
             "character_count": len(text),
+            # str.split() is the cheapest exact count; counting regex matches
+            # is several times slower and str.count(' ') is only approximate
             "word_count": len(text.split()),
         }
         
@@ -155,4 +189,41 @@ class ProcessingStrategy(ABC):
             metadata=base_metadata,
             start_position=start_pos,
             end_position=end_pos
-        )
\ No newline at end of file
+        )
+    
+    def create_chunk(
+        self, 
+        text: str, 
+        build_metadata: Callable[[], Dict[str, Any]], 
+        start_pos: int, 
+        end_pos: int,
+        lazy_metadata: bool = False
+    ) -> ChunkMetadata:
+        """
+        Create a chunk, deferring its metadata when lazy metadata is enabled.
+        
+        Args:
+            text (str): Chunk text content
+            build_metadata (Callable[[], Dict[str, Any]]): Builds the chunk metadata;
+                must be picklable (e.g. functools.partial of a strategy method)
+            start_pos (int): Start position in original document
+            end_pos (int): End position in original document
+            lazy_metadata (bool): Build metadata on first access instead of now
+            
+        Returns:
+            ChunkMetadata: Chunk with eager or lazily built metadata
+        """
+        if lazy_metadata:
+            return LazyChunkMetadata(
+                text=text,
+                metadata_factory=build_metadata,
+                start_position=start_pos,
+                end_position=end_pos
+            )
+        
+        return ChunkMetadata(
+            text=text,
+            metadata=build_metadata(),
+            start_position=start_pos,
+            end_position=end_pos
+        )
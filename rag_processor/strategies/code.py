@@ -5,16 +5,195 @@ Specialized for code documentation with function/class-based chunking
 that preserves code structure and documentation relationships.
 """
 
+import json
 import re
-from typing import List, Dict, Any
+from functools import lru_cache, partial
+from itertools import chain
+from typing import List, Dict, Any, NamedTuple, Optional
 
 from .base import ProcessingStrategy
 from ..utils.directive_parser import ProcessingDirective
-from ..utils.text_utils import ChunkMetadata, TextChunker
+from ..utils.text_utils import ChunkMetadata, TextChunker, at_least, strip_span
 from ..clients.base import ClientConfig
 from config.constants import CODE_CHUNK_OVERLAP
 
 
+# Indicators that content is code documentation
+_CODE_INDICATOR_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE | re.DOTALL)
+    for pattern in [
+        r'def\s+\w+\(',
+        r'function\s+\w+\(',
+        r'class\s+\w+',
+        r'API|api',
+        r'```[\w]*\n',
+        r'@param|@return',
+        r'import\s+\w+',
+        r'##\s+[A-Z]',
+        # Unrolled forms of '""".*?"""' and '/\*\*.*?\*/': the loop body cannot
+        # consume the closing delimiter, so no lazy stepping is needed. The
+        # literal-prefix scan skips content without an opener faster than a
+        # separate `in` check would
+        r'"""[^"]*(?:"(?!"")[^"]*)*"""',
+        r'/\*\*[^*]*(?:\*(?!/)[^*]*)*\*/',
+        r'//.*',
+    ]
+]
+
+_FUNCTION_DEF_RE = re.compile(r'def\s+\w+\(|function\s+\w+\(')
+_CLASS_DEF_RE = re.compile(r'class\s+\w+')
+_DEFINITION_RE = re.compile(r'def\s+\w+\(|function\s+\w+\(|class\s+\w+')
+
+# Patterns for different code elements: (pattern, section type, name pattern)
+_CODE_SECTION_PATTERNS = [
+    (re.compile(r'###?\s+(def\s+\w+\([^)]*\))', re.MULTILINE), 'function', re.compile(r'def\s+(\w+)\(')),
+    (re.compile(r'###?\s+(function\s+\w+\([^)]*\))', re.MULTILINE), 'function', re.compile(r'function\s+(\w+)\(')),
+    (re.compile(r'###?\s+(class\s+\w+)', re.MULTILINE), 'class', re.compile(r'class\s+(\w+)')),
+    (re.compile(r'##\s+([A-Z][A-Za-z\s]+)', re.MULTILINE), 'section', None),
+    (re.compile(r'###\s+([A-Z][A-Za-z\s]+)', re.MULTILINE), 'subsection', None),
+]
+
+# Zero-width alternation of the section patterns; finditer on it yields, in
+# order, every position where any section pattern matches, overlapping or not
+_CODE_SECTION_START_RE = re.compile(
+    '(?=' + '|'.join(f'(?:{pattern.pattern})' for pattern, _, _ in _CODE_SECTION_PATTERNS) + ')',
+    re.MULTILINE
+)
+
+_HEADER_RE = re.compile(r'^#{1,6}\s+(.+)$', re.MULTILINE)
+_PARAGRAPH_SEPARATOR_RE = re.compile(r'\n\s*\n')
+
+# Language indicators, checked in order; the first language with a match wins
+_LANGUAGE_INDICATORS = {
+    language: [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+    for language, patterns in {
+        'python': [r'def\s+\w+\(', r'import\s+\w+', r'from\s+\w+\s+import', r'""".*?"""'],
+        'javascript': [r'function\s+\w+\(', r'const\s+\w+\s*=', r'let\s+\w+\s*=', r'=>'],
+        'java': [r'public\s+class', r'private\s+\w+', r'public\s+static', r'@Override'],
+        'c': [r'#include\s*<', r'int\s+main\(', r'printf\(', r'malloc\('],
+        'cpp': [r'#include\s*<', r'std::', r'class\s+\w+', r'namespace\s+\w+'],
+        'go': [r'func\s+\w+\(', r'package\s+\w+', r'import\s*\(', r'type\s+\w+\s+struct'],
+        'rust': [r'fn\s+\w+\(', r'use\s+\w+', r'struct\s+\w+', r'impl\s+\w+'],
+    }.items()
+}
+_CODE_BLOCK_LANGUAGE_RE = re.compile(r'```(\w+)')
+
+# Documentation feature probes for _analyze_code_content; kept as separate
+# searches, each of which stops at its first hit (a single named-group
+# alternation over all of them measured several times slower)
+_PARAMETERS_RE = re.compile(r'@param|Parameters?:', re.IGNORECASE)
+_RETURNS_RE = re.compile(r'@return|Returns?:', re.IGNORECASE)
+_EXAMPLE_LABEL_RE = re.compile(r'Example:', re.IGNORECASE)
+_LINK_RE = re.compile(r'https?://|www\.')
+_API_RE = re.compile(r'API|endpoint|request|response', re.IGNORECASE)
+_HTTP_METHOD_RE = re.compile(r'GET|POST|PUT|DELETE|PATCH')
+_PARAMETER_LIST_RE = re.compile(r'\(([^)]*)\)')
+
+# Example content appended after the template header
+_TEMPLATE_BODY = """
+# Code Documentation Template
+
+## Overview
+
+This document provides comprehensive documentation for the API functions and classes.
+
+## Authentication
+
+All API calls require authentication using the following method:
+
+```python
+import requests
+
+headers = {
+    "Authorization": "Bearer YOUR_API_KEY"
+}
+```
+
+## Core Functions
+
+### def create_user(name, email)
+
+Creates a new user in the system.
+
+**Parameters:**
+- `name` (str): The user's full name
+- `email` (str): The user's email address
+
+**Returns:**
+- `dict`: User object with id, name, and email
+
+**Example:**
+```python
+user = create_user("John Doe", "john@example.com")
+print(user['id'])  # Output: 12345
+```
+
+### def get_user(user_id)
+
+Retrieves a user by their ID.
+
+**Parameters:**
+- `user_id` (int): The unique identifier for the user
+
+**Returns:**
+- `dict`: User object if found, None otherwise
+
+**Example:**
+```python
+user = get_user(12345)
+if user:
+    print(f"User name: {user['name']}")
+```
+
+## Data Classes
+
+### class UserManager
+
+Manages user-related operations and data persistence.
+
+**Attributes:**
+- `database_url` (str): Connection string for the database
+- `cache_enabled` (bool): Whether caching is enabled
+
+**Methods:**
+- `connect()`: Establishes database connection
+- `disconnect()`: Closes database connection
+- `create_user(data)`: Creates a new user record
+
+# Continue adding functions, classes, and API endpoints following the same structure."""
+
+
+class _CodeSection(NamedTuple):
+    """A function, class or documentation section found in code docs."""
+    
+    text: str
+    name: str
+    type: str
+    start_pos: int
+    end_pos: int
+    language: str
+
+
+@lru_cache(maxsize=1024)
+def _detect_language(text: str) -> str:
+    """
+    Detect programming language from code content.
+    
+    Memoized on the full text, since the same sections recur across
+    related documents and detection may scan the text many times.
+    """
+    for language, patterns in _LANGUAGE_INDICATORS.items():
+        if any(pattern.search(text) for pattern in patterns):
+            return language
+    
+    # Check for code blocks with language hints
+    code_block_match = _CODE_BLOCK_LANGUAGE_RE.search(text)
+    if code_block_match:
+        return code_block_match.group(1).lower()
+    
+    return "unknown"
+
+
 class CodeStrategy(ProcessingStrategy):
     """
     Code documentation processing strategy.
@@ -23,25 +202,10 @@ class CodeStrategy(ProcessingStrategy):
     documentation blocks, and maintaining API relationships.
     """
     
-    @property
-    def name(self) -> str:
-        """Strategy name in format 'category/method'."""
-        return "code/function-based"
-    
-    @property
-    def description(self) -> str:
-        """Human-readable description of the strategy."""
-        return "Code documentation chunking at function/class boundaries with structure preservation"
-    
-    @property
-    def default_chunk_pattern(self) -> str:
-        """Default regex pattern for code boundaries."""
-        return r'(def\s+\w+\(|function\s+\w+\(|class\s+\w+|##\s+[A-Z])'
-    
-    @property
-    def default_overlap(self) -> int:
-        """Default character overlap between chunks."""
-        return CODE_CHUNK_OVERLAP
+    name = "code/function-based"
+    description = "Code documentation chunking at function/class boundaries with structure preservation"
+    default_chunk_pattern = r'(def\s+\w+\(|function\s+\w+\(|class\s+\w+|##\s+[A-Z])'
+    default_overlap = CODE_CHUNK_OVERLAP
     
     def process(
         self, 
@@ -86,38 +250,21 @@ class CodeStrategy(ProcessingStrategy):
         """
         issues = []
         
-        # Check for code documentation indicators
-        code_indicators = [
-            r'def\s+\w+\(',
-            r'function\s+\w+\(',
-            r'class\s+\w+',
-            r'API|api',
-            r'```[\w]*\n',
-            r'@param|@return',
-            r'import\s+\w+',
-            r'##\s+[A-Z]',
-            r'""".*?"""',
-            r'/\*\*.*?\*/',
-            r'//.*',
-        ]
-        
-        indicator_matches = 0
-        for pattern in code_indicators:
-            matches = len(re.findall(pattern, content, re.IGNORECASE | re.DOTALL))
-            indicator_matches += matches
+        # Check for code documentation indicators; scanning stops once enough
+        # matches are found
+        indicator_matches = chain.from_iterable(
+            pattern.finditer(content) for pattern in _CODE_INDICATOR_PATTERNS
+        )
         
-        if indicator_matches < 3:
+        if not at_least(indicator_matches, 3):
             issues.append("Content doesn't appear to be code documentation format")
         
-        # Check for function/class definitions
-        function_count = len(re.findall(r'def\s+\w+\(|function\s+\w+\(', content))
-        class_count = len(re.findall(r'class\s+\w+', content))
-        
-        if function_count == 0 and class_count == 0:
+        # Check for function/class definitions in a single scan
+        if not _DEFINITION_RE.search(content):
             issues.append("No function or class definitions detected")
         
         # Check for code blocks
-        code_block_count = len(re.findall(r'```', content))
+        code_block_count = content.count('```')
         if code_block_count < 2:
             issues.append("Very few code blocks detected - may not be code documentation")
         
@@ -152,7 +299,6 @@ class CodeStrategy(ProcessingStrategy):
         }
         metadata.update(client_metadata)
         
-        import json
         template_parts.append(f"#!metadata: {json.dumps(metadata, separators=(',', ':'))}")
         
         # Add custom rules
@@ -160,82 +306,9 @@ class CodeStrategy(ProcessingStrategy):
         if custom_rules:
             template_parts.append(f"#!custom-rules: {json.dumps(custom_rules, separators=(',', ':'))}")
         
-        # Add example content
-        template_parts.extend([
-            "",
-            "# Code Documentation Template",
-            "",
-            "## Overview",
-            "",
-            "This document provides comprehensive documentation for the API functions and classes.",
-            "",
-            "## Authentication",
-            "",
-            "All API calls require authentication using the following method:",
-            "",
-            "```python",
-            "import requests",
-            "",
-            "headers = {",
-            '    "Authorization": "Bearer YOUR_API_KEY"',
-            "}",
-            "```",
-            "",
-            "## Core Functions",
-            "",
-            "### def create_user(name, email)",
-            "",
-            "Creates a new user in the system.",
-            "",
-            "**Parameters:**",
-            "- `name` (str): The user's full name",
-            "- `email` (str): The user's email address",
-            "",
-            "**Returns:**",
-            "- `dict`: User object with id, name, and email",
-            "",
-            "**Example:**",
-            "```python",
-            'user = create_user("John Doe", "john@example.com")',
-            "print(user['id'])  # Output: 12345",
-            "```",
-            "",
-            "### def get_user(user_id)",
-            "",
-            "Retrieves a user by their ID.",
-            "",
-            "**Parameters:**",
-            "- `user_id` (int): The unique identifier for the user",
-            "",
-            "**Returns:**",
-            "- `dict`: User object if found, None otherwise",
-            "",
-            "**Example:**",
-            "```python",
-            "user = get_user(12345)",
-            "if user:",
-            '    print(f"User name: {user[\'name\']}")',
-            "```",
-            "",
-            "## Data Classes",
-            "",
-            "### class UserManager",
-            "",
-            "Manages user-related operations and data persistence.",
-            "",
-            "**Attributes:**",
-            "- `database_url` (str): Connection string for the database",
-            "- `cache_enabled` (bool): Whether caching is enabled",
-            "",
-            "**Methods:**",
-            "- `connect()`: Establishes database connection",
-            "- `disconnect()`: Closes database connection",
-            "- `create_user(data)`: Creates a new user record",
-            "",
-            "# Continue adding functions, classes, and API endpoints following the same structure.",
-        ])
-        
-        return '\n'.join(template_parts)
+        # Append the static example content
+        header = '\n'.join(template_parts)
+        return f"{header}\n{_TEMPLATE_BODY}"
     
     def _chunk_by_code_structure(self, content: str, overlap: int, client_config: ClientConfig) -> List[ChunkMetadata]:
         """
@@ -255,108 +328,111 @@ class CodeStrategy(ProcessingStrategy):
         code_sections = self._extract_code_sections(content)
         
         if code_sections:
-            chunks = self._process_code_sections(code_sections, overlap)
+            chunks = self._process_code_sections(code_sections, overlap, client_config.lazy_metadata)
         else:
             # Fallback to header-based processing
-            chunks = self._process_by_headers(content, overlap)
+            chunks = self._process_by_headers(content, overlap, client_config.lazy_metadata)
         
         return chunks
     
-    def _extract_code_sections(self, content: str) -> List[Dict[str, Any]]:
+    def _extract_code_sections(self, content: str) -> List[_CodeSection]:
         """Extract code sections (functions, classes, etc.) from content."""
         sections = []
         
-        # Patterns for different code elements
-        code_patterns = [
-            (r'###?\s+(def\s+\w+\([^)]*\))', 'function', r'def\s+(\w+)\('),
-            (r'###?\s+(function\s+\w+\([^)]*\))', 'function', r'function\s+(\w+)\('),
-            (r'###?\s+(class\s+\w+)', 'class', r'class\s+(\w+)'),
-            (r'##\s+([A-Z][A-Za-z\s]+)', 'section', None),
-            (r'###\s+([A-Z][A-Za-z\s]+)', 'subsection', None),
-        ]
+        # Collect every position where any section could start once, so each
+        # section end is a lookup instead of a rescan of the remaining content
+        section_starts = [start_match.start() for start_match in _CODE_SECTION_START_RE.finditer(content)]
+        section_starts.append(len(content))  # End of document closes the last section
         
-        for pattern, section_type, name_pattern in code_patterns:
-            matches = list(re.finditer(pattern, content, re.MULTILINE))
+        for pattern, section_type, name_pattern in _CODE_SECTION_PATTERNS:
+            next_index = 0
             
-            for i, match in enumerate(matches):
+            for match in pattern.finditer(content):
                 section_start = match.start()
                 
-                # Find section end (next section or end of document)
-                next_match_start = len(content)
-                for other_pattern, _, _ in code_patterns:
-                    other_matches = list(re.finditer(other_pattern, content[section_start + 1:], re.MULTILINE))
-                    if other_matches:
-                        candidate_end = section_start + 1 + other_matches[0].start()
-                        if candidate_end < next_match_start:
-                            next_match_start = candidate_end
+                # Find section end (next section or end of document); matches
+                # come in order, so the boundary index only moves forward
+                while section_starts[next_index] <= section_start:
+                    next_index += 1
+                next_match_start = section_starts[next_index]
                 
-                section_text = content[section_start:next_match_start].strip()
+                # Measure the stripped section by offsets; only copy it out if kept
+                text_start, text_end = strip_span(content, section_start, next_match_start)
                 
-                if len(section_text) > 50:  # Only include substantial sections
+                if text_end - text_start > 50:  # Only include substantial sections
+                    section_text = content[text_start:text_end]
+                    
                     # Extract name
                     name = match.group(1)
                     if name_pattern:
-                        name_match = re.search(name_pattern, name)
+                        name_match = name_pattern.search(name)
                         if name_match:
                             name = name_match.group(1)
                     
-                    sections.append({
-                        "text": section_text,
-                        "name": name,
-                        "type": section_type,
-                        "start_pos": section_start,
-                        "end_pos": next_match_start,
-                        "language": self._detect_language(section_text),
-                    })
+                    sections.append(_CodeSection(
+                        text=section_text,
+                        name=name,
+                        type=section_type,
+                        start_pos=section_start,
+                        end_pos=next_match_start,
+                        language=self._detect_language(section_text),
+                    ))
         
         # Sort by position to maintain order
-        sections.sort(key=lambda x: x["start_pos"])
+        sections.sort(key=lambda x: x.start_pos)
         
         return sections
     
-    def _process_code_sections(self, sections: List[Dict], overlap: int) -> List[ChunkMetadata]:
+    def _process_code_sections(
+        self, 
+        sections: List[_CodeSection], 
+        overlap: int, 
+        lazy_metadata: bool = False
+    ) -> List[ChunkMetadata]:
         """Process code sections into chunks."""
         chunks = []
         
         for section in sections:
-            section_text = section["text"]
+            section_text = section.text
             
             # For large sections, consider splitting
             if len(section_text) > 2500:
-                sub_chunks = self._split_large_code_section(section, overlap)
+                sub_chunks = self._split_large_code_section(section, overlap, lazy_metadata)
                 chunks.extend(sub_chunks)
             else:
                 # Create single chunk for section
-                code_metadata = self._analyze_code_content(section_text, section)
-                
-                chunk_metadata = {
-                    "strategy": self.name,
-                    "chunk_index": len(chunks),
-                    "code_element_name": section["name"],
-                    "code_element_type": section["type"],
-                    "programming_language": section["language"],
-                    "chunking_method": "code-structure",
-                    **code_metadata
-                }
-                
-                chunk = ChunkMetadata(
-                    text=section_text,
-                    metadata=chunk_metadata,
-                    start_position=section["start_pos"],
-                    end_position=section["end_pos"]
+                chunk = self.create_chunk(
+                    section_text,
+                    partial(self._build_section_chunk_metadata, section, len(chunks)),
+                    section.start_pos,
+                    section.end_pos,
+                    lazy_metadata
                 )
                 
                 chunks.append(chunk)
         
         return chunks
     
-    def _process_by_headers(self, content: str, overlap: int) -> List[ChunkMetadata]:
+    def _build_section_chunk_metadata(self, section: _CodeSection, chunk_index: int) -> Dict[str, Any]:
+        """Build the metadata dict for a whole code section chunk."""
+        code_metadata = self._analyze_code_content(section.text, section)
+        
+        return {
+            "strategy": self.name,
+            "chunk_index": chunk_index,
+            "code_element_name": section.name,
+            "code_element_type": section.type,
+            "programming_language": section.language,
+            "chunking_method": "code-structure",
+            **code_metadata
+        }
+    
+    def _process_by_headers(self, content: str, overlap: int, lazy_metadata: bool = False) -> List[ChunkMetadata]:
         """Process content by headers when no code structure is found."""
         chunks = []
         
         # Use markdown-style headers
-        header_pattern = r'^#{1,6}\s+(.+)$'
-        header_matches = list(re.finditer(header_pattern, content, re.MULTILINE))
+        header_matches = list(_HEADER_RE.finditer(content))
         
         if not header_matches:
             # Final fallback to size-based chunking
@@ -376,35 +452,53 @@ class CodeStrategy(ProcessingStrategy):
             if len(section_text) > 100:
                 header_level = len(match.group().split()[0])  # Count # characters
                 
-                chunk_metadata = {
-                    "strategy": self.name,
-                    "chunk_index": len(chunks),
-                    "section_title": match.group(1).strip(),
-                    "header_level": header_level,
-                    "chunking_method": "header-based",
-                    **self._analyze_code_content(section_text)
-                }
-                
-                chunk = ChunkMetadata(
-                    text=section_text,
-                    metadata=chunk_metadata,
-                    start_position=section_start,
-                    end_position=section_end
+                chunk = self.create_chunk(
+                    section_text,
+                    partial(
+                        self._build_header_chunk_metadata,
+                        section_text, match.group(1).strip(), header_level, len(chunks)
+                    ),
+                    section_start,
+                    section_end,
+                    lazy_metadata
                 )
                 
                 chunks.append(chunk)
         
         return chunks
     
-    def _split_large_code_section(self, section: Dict, overlap: int) -> List[ChunkMetadata]:
+    def _build_header_chunk_metadata(
+        self, 
+        section_text: str, 
+        section_title: str, 
+        header_level: int, 
+        chunk_index: int
+    ) -> Dict[str, Any]:
+        """Build the metadata dict for a header-based chunk."""
+        return {
+            "strategy": self.name,
+            "chunk_index": chunk_index,
+            "section_title": section_title,
+            "header_level": header_level,
+            "chunking_method": "header-based",
+            **self._analyze_code_content(section_text)
+        }
+    
+    def _split_large_code_section(
+        self, 
+        section: _CodeSection, 
+        overlap: int, 
+        lazy_metadata: bool = False
+    ) -> List[ChunkMetadata]:
         """Split large code sections into smaller chunks."""
-        text = section["text"]
+        text = section.text
         chunks = []
         
         # Try to split by subsections or paragraphs
-        split_pattern = r'\n\s*\n'
-        parts = re.split(split_pattern, text)
+        parts = _PARAGRAPH_SEPARATOR_RE.split(text)
         
+        # Parts are buffered in a list and joined once per emitted chunk;
+        # measured faster than accumulating into an io.StringIO
         current_chunk = []
         current_size = 0
         target_size = 1500
@@ -415,28 +509,9 @@ class CodeStrategy(ProcessingStrategy):
             if current_size + part_size > target_size and current_chunk:
                 # Create chunk
                 chunk_text = '\n\n'.join(current_chunk)
-                
-                code_metadata = self._analyze_code_content(chunk_text, section)
-                
-                chunk_metadata = {
-                    "strategy": self.name,
-                    "chunk_index": len(chunks),
-                    "code_element_name": section["name"],
-                    "code_element_type": section["type"],
-                    "section_part": f"Part {len(chunks) + 1}",
-                    "programming_language": section["language"],
-                    "chunking_method": "code-section-split",
-                    **code_metadata
-                }
-                
-                chunk = ChunkMetadata(
-                    text=chunk_text,
-                    metadata=chunk_metadata,
-                    start_position=section["start_pos"],
-                    end_position=section["start_pos"] + len(chunk_text)
-                )
-                
-                chunks.append(chunk)
+                chunks.append(self._create_split_chunk(
+                    section, chunk_text, len(chunks), section.start_pos + len(chunk_text), lazy_metadata
+                ))
                 current_chunk = []
                 current_size = 0
             
@@ -446,82 +521,79 @@ class CodeStrategy(ProcessingStrategy):
         # Add final chunk
         if current_chunk:
             chunk_text = '\n\n'.join(current_chunk)
-            
-            code_metadata = self._analyze_code_content(chunk_text, section)
-            
-            chunk_metadata = {
-                "strategy": self.name,
-                "chunk_index": len(chunks),
-                "code_element_name": section["name"],
-                "code_element_type": section["type"],
-                "section_part": f"Part {len(chunks) + 1}",
-                "programming_language": section["language"],
-                "chunking_method": "code-section-split",
-                **code_metadata
-            }
-            
-            chunk = ChunkMetadata(
-                text=chunk_text,
-                metadata=chunk_metadata,
-                start_position=section["start_pos"],
-                end_position=section["end_pos"]
-            )
-            
-            chunks.append(chunk)
+            chunks.append(self._create_split_chunk(
+                section, chunk_text, len(chunks), section.end_pos, lazy_metadata
+            ))
         
         return chunks
     
+    def _create_split_chunk(
+        self, 
+        section: _CodeSection, 
+        chunk_text: str, 
+        chunk_index: int, 
+        end_pos: int,
+        lazy_metadata: bool = False
+    ) -> ChunkMetadata:
+        """Create one part of a split code section."""
+        return self.create_chunk(
+            chunk_text,
+            partial(self._build_split_chunk_metadata, section, chunk_text, chunk_index),
+            section.start_pos,
+            end_pos,
+            lazy_metadata
+        )
+    
+    def _build_split_chunk_metadata(
+        self, 
+        section: _CodeSection, 
+        chunk_text: str, 
+        chunk_index: int
+    ) -> Dict[str, Any]:
+        """Build the metadata dict for one part of a split code section."""
+        code_metadata = self._analyze_code_content(chunk_text, section)
+        
+        return {
+            "strategy": self.name,
+            "chunk_index": chunk_index,
+            "code_element_name": section.name,
+            "code_element_type": section.type,
+            "section_part": f"Part {chunk_index + 1}",
+            "programming_language": section.language,
+            "chunking_method": "code-section-split",
+            **code_metadata
+        }
+    
     def _detect_language(self, text: str) -> str:
         """Detect programming language from code content."""
-        language_indicators = {
-            'python': [r'def\s+\w+\(', r'import\s+\w+', r'from\s+\w+\s+import', r'""".*?"""'],
-            'javascript': [r'function\s+\w+\(', r'const\s+\w+\s*=', r'let\s+\w+\s*=', r'=>'],
-            'java': [r'public\s+class', r'private\s+\w+', r'public\s+static', r'@Override'],
-            'c': [r'#include\s*<', r'int\s+main\(', r'printf\(', r'malloc\('],
-            'cpp': [r'#include\s*<', r'std::', r'class\s+\w+', r'namespace\s+\w+'],
-            'go': [r'func\s+\w+\(', r'package\s+\w+', r'import\s*\(', r'type\s+\w+\s+struct'],
-            'rust': [r'fn\s+\w+\(', r'use\s+\w+', r'struct\s+\w+', r'impl\s+\w+'],
-        }
-        
-        text_lower = text.lower()
-        
-        for language, patterns in language_indicators.items():
-            score = sum(len(re.findall(pattern, text_lower)) for pattern in patterns)
-            if score > 0:
-                return language
-        
-        # Check for code blocks with language hints
-        code_block_match = re.search(r'```(\w+)', text)
-        if code_block_match:
-            return code_block_match.group(1).lower()
-        
-        return "unknown"
+        return _detect_language(text)
     
-    def _analyze_code_content(self, text: str, section: Dict = None) -> Dict[str, Any]:
+    def _analyze_code_content(self, text: str, section: Optional[_CodeSection] = None) -> Dict[str, Any]:
         """Analyze code content for metadata."""
         analysis = {}
         
         # Count code blocks
-        analysis["code_block_count"] = len(re.findall(r'```', text))
+        code_block_count = text.count('```')
+        analysis["code_block_count"] = code_block_count
         
-        # Detect documentation elements
-        analysis["has_parameters"] = bool(re.search(r'@param|Parameters?:', text, re.IGNORECASE))
-        analysis["has_returns"] = bool(re.search(r'@return|Returns?:', text, re.IGNORECASE))
-        analysis["has_examples"] = bool(re.search(r'Example:|```', text, re.IGNORECASE))
-        analysis["has_links"] = bool(re.search(r'https?://|www\.', text))
+        # Detect documentation elements (a code fence counts as an example)
+        analysis["has_parameters"] = bool(_PARAMETERS_RE.search(text))
+        analysis["has_returns"] = bool(_RETURNS_RE.search(text))
+        analysis["has_examples"] = code_block_count > 0 or bool(_EXAMPLE_LABEL_RE.search(text))
+        analysis["has_links"] = bool(_LINK_RE.search(text))
         
         # Count function/method definitions
-        analysis["function_count"] = len(re.findall(r'def\s+\w+\(|function\s+\w+\(', text))
-        analysis["class_count"] = len(re.findall(r'class\s+\w+', text))
+        analysis["function_count"] = len(_FUNCTION_DEF_RE.findall(text))
+        analysis["class_count"] = len(_CLASS_DEF_RE.findall(text))
         
         # Detect API-related content
-        analysis["is_api_doc"] = bool(re.search(r'API|endpoint|request|response', text, re.IGNORECASE))
-        analysis["has_http_methods"] = bool(re.search(r'GET|POST|PUT|DELETE|PATCH', text))
+        analysis["is_api_doc"] = bool(_API_RE.search(text))
+        analysis["has_http_methods"] = bool(_HTTP_METHOD_RE.search(text))
         
         # Complexity indicators
-        if section and section.get("type") == "function":
+        if section is not None and section.type == "function":
             # Count parameters for functions
-            param_match = re.search(r'\(([^)]*)\)', section.get("name", ""))
+            param_match = _PARAMETER_LIST_RE.search(section.name)
             if param_match:
                 params = [p.strip() for p in param_match.group(1).split(',') if p.strip()]
                 analysis["parameter_count"] = len(params)
@@ -5,16 +5,155 @@ Specialized for FAQ documents with Q&A pair chunking to maintain
 question-answer relationships and optimize for search.
 """
 
+import json
 import re
-from typing import List, Dict, Any
+from functools import lru_cache, partial
+from itertools import chain, islice
+from typing import List, Dict, Any, NamedTuple, Optional, Tuple
 
 from .base import ProcessingStrategy
 from ..utils.directive_parser import ProcessingDirective
-from ..utils.text_utils import ChunkMetadata, TextChunker
+from ..utils.text_utils import ChunkMetadata, TextChunker, at_least, strip_span
 from ..clients.base import ClientConfig
 from config.constants import FAQ_CHUNK_OVERLAP
 
 
+# Indicators that content is FAQ format
+_FAQ_INDICATOR_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE | re.MULTILINE)
+    for pattern in [
+        r'(Q:|Question:|Pergunta:)',
+        r'(A:|Answer:|Resposta:)',
+        r'FAQ|F\.A\.Q\.',
+        r'Frequently\s+Asked',
+        r'^\d+\.\s*.+\?',
+    ]
+]
+
+# Q&A extraction patterns
+_QA_MARKER_RE = re.compile(r'\b(Q:|Question:|Pergunta:|A:|Answer:|Resposta:)', re.IGNORECASE)
+# Case-sensitive twin for lowercased ASCII content, which keeps the same offsets
+_QA_MARKER_LOWER_RE = re.compile(r'\b(q:|question:|pergunta:|a:|answer:|resposta:)')
+_QUESTION_MARKERS = ("q:", "question:", "pergunta:")
+_NUMBERED_QUESTION_RE = re.compile(r'^\d+\.\s*(.+\?)', re.MULTILINE)
+_PARAGRAPH_SEPARATOR_RE = re.compile(r'\n\s*\n')
+
+# Q&A analysis patterns
+# Case-sensitive, unlike the extraction markers; stripped with str.startswith
+_QUESTION_PREFIXES = ("Q:", "Question:", "Pergunta:")
+# Question types in priority order: (type, keywords, pattern). A pattern can
+# only match if one of its keywords occurs in the lowercased question, so
+# the cheap substring test gates the word-boundary regex
+_QUESTION_TYPE_PATTERNS = [
+    ("definition", ("what", "o que"), re.compile(r'\b(what|o que)\b', re.IGNORECASE)),
+    ("procedure", ("how", "como"), re.compile(r'\b(how|como)\b', re.IGNORECASE)),
+    ("explanation", ("why", "por que"), re.compile(r'\b(why|por que)\b', re.IGNORECASE)),
+    ("timing", ("when", "quando"), re.compile(r'\b(when|quando)\b', re.IGNORECASE)),
+    ("location", ("where", "onde"), re.compile(r'\b(where|onde)\b', re.IGNORECASE)),
+]
+_TOPIC_WORD_RE = re.compile(r'\b[a-zA-Z]{4,}\b')
+_LINK_RE = re.compile(r'https?://|www\.')
+_EXAMPLE_RE = re.compile(r'example|exemplo|for instance', re.IGNORECASE)
+_STEPS_RE = re.compile(r'\d+\.\s+|\n\s*[-*]\s+')
+
+
+# Shared encoder for template directives; json.dumps with non-default
+# separators builds a new encoder on every call
+_COMPACT_JSON_ENCODER = json.JSONEncoder(separators=(',', ':'))
+
+# Example content appended after the template header
+_TEMPLATE_BODY = """
+# FAQ Template
+
+Q: What is this product/service?
+A: This is a comprehensive explanation of what the product or service does and its main benefits.
+
+Q: How do I get started?
+A: To get started, follow these simple steps:
+1. First step
+2. Second step
+3. Third step
+
+Q: What are the pricing options?
+A: We offer several pricing tiers to meet different needs. Please visit our pricing page for detailed information.
+
+Q: How can I contact support?
+A: You can reach our support team through:
+- Email: support@example.com
+- Phone: (555) 123-4567
+- Live chat on our website
+
+# Continue adding Q&A pairs following the same format."""
+
+
+class _QAAnalysis(NamedTuple):
+    """Metadata extracted from a Q&A pair."""
+    question_clean: str
+    answer_length: int
+    answer_word_count: int
+    question_type: str
+    topics: Tuple[str, ...]
+    has_links: bool
+    has_examples: bool
+    has_steps: bool
+    difficulty: str
+
+
+@lru_cache(maxsize=1024)
+def _analyze_qa_pair(question: str, answer: str) -> _QAAnalysis:
+    """
+    Analyze Q&A pair for metadata extraction.
+    
+    Memoized on the pair, since boilerplate Q&A recurs across client
+    variants of the same FAQ.
+    """
+    # Clean question text
+    question_clean = question
+    for prefix in _QUESTION_PREFIXES:
+        if question.startswith(prefix):
+            question_clean = question[len(prefix):]
+            break
+    question_clean = question_clean.strip()
+    
+    # Answer length and complexity
+    answer_word_count = len(answer.split())
+    
+    question_lower = question_clean.lower()
+    
+    # Classify question type
+    question_type = "general"
+    for candidate_type, keywords, pattern in _QUESTION_TYPE_PATTERNS:
+        if any(keyword in question_lower for keyword in keywords) and pattern.search(question_clean):
+            question_type = candidate_type
+            break
+    
+    # Extract topics/keywords
+    # Simple keyword extraction from question; matching stops after the
+    # first 5 words, so long marker-delimited questions are not fully scanned
+    topics = tuple(match.group() for match in islice(_TOPIC_WORD_RE.finditer(question_lower), 5))
+    
+    # Estimate difficulty
+    if answer_word_count < 20:
+        difficulty = "basic"
+    elif answer_word_count > 100:
+        difficulty = "advanced"
+    else:
+        difficulty = "intermediate"
+    
+    return _QAAnalysis(
+        question_clean=question_clean,
+        answer_length=len(answer),
+        answer_word_count=answer_word_count,
+        question_type=question_type,
+        topics=topics,
+        # Detect content features
+        has_links=bool(_LINK_RE.search(answer)),
+        has_examples=bool(_EXAMPLE_RE.search(answer)),
+        has_steps=bool(_STEPS_RE.search(answer)),
+        difficulty=difficulty
+    )
+
+
 class FAQStrategy(ProcessingStrategy):
     """
     FAQ processing strategy.
@@ -23,25 +162,10 @@ class FAQStrategy(ProcessingStrategy):
     question-answer relationships for optimal search performance.
     """
     
-    @property
-    def name(self) -> str:
-        """Strategy name in format 'category/method'."""
-        return "faq/qa-pairs"
-    
-    @property
-    def description(self) -> str:
-        """Human-readable description of the strategy."""
-        return "FAQ chunking at Q&A pair boundaries to preserve question-answer relationships"
-    
-    @property
-    def default_chunk_pattern(self) -> str:
-        """Default regex pattern for Q&A boundaries."""
-        return r'(Q:|Question:|Pergunta:)\s*(.+?)(?=(Q:|Question:|Pergunta:|A:|Answer:|Resposta:))'
-    
-    @property
-    def default_overlap(self) -> int:
-        """Default character overlap between chunks."""
-        return FAQ_CHUNK_OVERLAP  # No overlap for Q&A pairs
+    name = "faq/qa-pairs"
+    description = "FAQ chunking at Q&A pair boundaries to preserve question-answer relationships"
+    default_chunk_pattern = r'(Q:|Question:|Pergunta:)\s*(.+?)(?=(Q:|Question:|Pergunta:|A:|Answer:|Resposta:))'
+    default_overlap = FAQ_CHUNK_OVERLAP  # No overlap for Q&A pairs
     
     def process(
         self, 
@@ -66,13 +190,15 @@ class FAQStrategy(ProcessingStrategy):
         # Try multiple FAQ patterns
         qa_pairs = self._extract_qa_pairs(content)
         
-        if not qa_pairs:
+        # Both fallbacks only match questions ending in '?', so documents
+        # without one skip their full-content scans
+        if not qa_pairs and '?' in content:
             # Fallback to numbered question pattern
             qa_pairs = self._extract_numbered_questions(content)
-        
-        if not qa_pairs:
-            # Final fallback - use question mark pattern
-            qa_pairs = self._extract_question_mark_pairs(content)
+            
+            if not qa_pairs:
+                # Final fallback - use question mark pattern
+                qa_pairs = self._extract_question_mark_pairs(content)
         
         if not qa_pairs:
             # No FAQ patterns found - use fallback chunking
@@ -80,42 +206,51 @@ class FAQStrategy(ProcessingStrategy):
         
         chunks = []
         
-        for i, (question, answer, start_pos, end_pos) in enumerate(qa_pairs):
+        for question, answer, start_pos, end_pos in qa_pairs:
+            # Skip very short Q&A pairs; stripping never lengthens the text,
+            # so pairs that are short before combining need no new string
+            if len(question) + len(answer) + 2 < 50:
+                continue
+            
             # Combine question and answer
             qa_text = f"{question}\n\n{answer}".strip()
             
-            # Skip very short Q&A pairs
             if len(qa_text) < 50:
                 continue
             
-            # Analyze Q&A content
-            qa_metadata = self._analyze_qa_pair(question, answer)
-            
             # Create chunk with Q&A metadata
-            chunk_metadata = {
-                "strategy": self.name,
-                "chunk_index": len(chunks),
-                "question": qa_metadata.get("question_clean"),
-                "answer_length": qa_metadata.get("answer_length", 0),
-                "question_type": qa_metadata.get("question_type", "general"),
-                "topics": qa_metadata.get("topics", []),
-                "has_links": qa_metadata.get("has_links", False),
-                "has_examples": qa_metadata.get("has_examples", False),
-                "difficulty_level": qa_metadata.get("difficulty", "basic"),
-                "chunking_method": "qa-pairs",
-            }
-            
-            chunk = ChunkMetadata(
-                text=qa_text,
-                metadata=chunk_metadata,
-                start_position=start_pos,
-                end_position=end_pos
+            chunk = self.create_chunk(
+                qa_text,
+                partial(self._build_qa_chunk_metadata, question, answer, len(chunks)),
+                start_pos,
+                end_pos,
+                client_config.lazy_metadata
             )
             
             chunks.append(chunk)
         
         return chunks
     
+    def _build_qa_chunk_metadata(self, question: str, answer: str, chunk_index: int) -> Dict[str, Any]:
+        """Build the metadata dict for a Q&A pair chunk."""
+        # Analyze Q&A content
+        qa_metadata = self._analyze_qa_pair(question, answer)
+        
+        # A dict literal is built at its final size, so it beats copying a
+        # prebuilt base dict
+        return {
+            "strategy": self.name,
+            "chunk_index": chunk_index,
+            "question": qa_metadata["question_clean"],
+            "answer_length": qa_metadata["answer_length"],
+            "question_type": qa_metadata["question_type"],
+            "topics": qa_metadata["topics"],
+            "has_links": qa_metadata["has_links"],
+            "has_examples": qa_metadata["has_examples"],
+            "difficulty_level": qa_metadata["difficulty"],
+            "chunking_method": "qa-pairs",
+        }
+    
     def validate_content(self, content: str, directive: ProcessingDirective) -> List[str]:
         """
         Validate that content is suitable for FAQ strategy.
@@ -129,26 +264,20 @@ class FAQStrategy(ProcessingStrategy):
         """
         issues = []
         
-        # Check for FAQ indicators
-        faq_indicators = [
-            r'(Q:|Question:|Pergunta:)',
-            r'(A:|Answer:|Resposta:)',
-            r'FAQ|F\.A\.Q\.',
-            r'Frequently\s+Asked',
-            r'^\d+\.\s*.+\?',
-        ]
-        
-        indicator_matches = 0
-        for pattern in faq_indicators:
-            matches = len(re.findall(pattern, content, re.IGNORECASE | re.MULTILINE))
-            indicator_matches += matches
+        # Check for FAQ indicators; scanning stops once enough matches are found
+        indicator_matches = chain.from_iterable(
+            pattern.finditer(content) for pattern in _FAQ_INDICATOR_PATTERNS
+        )
         
-        if indicator_matches < 4:
+        if not at_least(indicator_matches, 4):
             issues.append("Content doesn't appear to be FAQ format")
         
         # Count questions vs answers
-        question_count = len(re.findall(r'\?', content))
-        answer_indicators = len(re.findall(r'(A:|Answer:|Resposta:)', content, re.IGNORECASE))
+        question_count = content.count('?')
+        # Case-insensitive count of A:/Answer:/Resposta: markers; every
+        # "resposta:" already contains exactly one "a:"
+        content_folded = content.casefold()
+        answer_indicators = content_folded.count('a:') + content_folded.count('answer:')
         
         if question_count < 3:
             issues.append("Very few questions detected")
@@ -187,71 +316,78 @@ class FAQStrategy(ProcessingStrategy):
         }
         metadata.update(client_metadata)
         
-        import json
-        template_parts.append(f"#!metadata: {json.dumps(metadata, separators=(',', ':'))}")
+        template_parts.append(f"#!metadata: {_COMPACT_JSON_ENCODER.encode(metadata)}")
         
         # Add custom rules
         custom_rules = client_config.customize_strategy_config(self.name)
         if custom_rules:
-            template_parts.append(f"#!custom-rules: {json.dumps(custom_rules, separators=(',', ':'))}")
-        
-        # Add example content
-        template_parts.extend([
-            "",
-            "# FAQ Template",
-            "",
-            "Q: What is this product/service?",
-            "A: This is a comprehensive explanation of what the product or service does and its main benefits.",
-            "",
-            "Q: How do I get started?",
-            "A: To get started, follow these simple steps:",
-            "1. First step",
-            "2. Second step", 
-            "3. Third step",
-            "",
-            "Q: What are the pricing options?",
-            "A: We offer several pricing tiers to meet different needs. Please visit our pricing page for detailed information.",
-            "",
-            "Q: How can I contact support?",
-            "A: You can reach our support team through:",
-            "- Email: support@example.com",
-            "- Phone: (555) 123-4567",
-            "- Live chat on our website",
-            "",
-            "# Continue adding Q&A pairs following the same format.",
-        ])
-        
-        return '\n'.join(template_parts)
+            template_parts.append(f"#!custom-rules: {_COMPACT_JSON_ENCODER.encode(custom_rules)}")
+        
+        # Append the static example content
+        header = '\n'.join(template_parts)
+        return f"{header}\n{_TEMPLATE_BODY}"
     
     def _extract_qa_pairs(self, content: str) -> List[tuple]:
-        """Extract Q&A pairs using explicit markers."""
+        """
+        Extract Q&A pairs using explicit markers.
+        
+        Markers are located in a single scan and the text between them is
+        sliced out: a question marker followed by an answer marker opens a
+        pair, and the answer runs until the next question marker.
+        """
         qa_pairs = []
         
-        # Pattern for Q: ... A: ... format
-        qa_pattern = r'(Q:|Question:|Pergunta:)\s*([^Q]*?)\s*(A:|Answer:|Resposta:)\s*([^Q]*?)(?=(Q:|Question:|Pergunta:)|$)'
+        # (start, end, marker) of the open question marker and of its answer marker
+        question: Optional[Tuple[int, int, str]] = None
+        answer: Optional[Tuple[int, int, str]] = None
         
-        matches = re.finditer(qa_pattern, content, re.IGNORECASE | re.DOTALL)
+        # A case-sensitive scan of lowercased text is cheaper than IGNORECASE,
+        # but lowercasing only preserves offsets for ASCII text
+        if content.isascii():
+            matches = _QA_MARKER_LOWER_RE.finditer(content.lower())
+        else:
+            matches = _QA_MARKER_RE.finditer(content)
         
         for match in matches:
-            question = f"{match.group(1)} {match.group(2).strip()}"
-            answer = f"{match.group(3)} {match.group(4).strip()}"
+            start, end = match.span()
+            marker = (start, end, content[start:end])
             
-            qa_pairs.append((
-                question,
-                answer, 
-                match.start(),
-                match.end()
-            ))
+            if marker[2].lower() in _QUESTION_MARKERS:
+                if question is not None and answer is not None:
+                    qa_pairs.append(self._slice_qa_pair(content, question, answer, match.start()))
+                question, answer = marker, None
+            elif question is not None and answer is None:
+                answer = marker
+        
+        if question is not None and answer is not None:
+            qa_pairs.append(self._slice_qa_pair(content, question, answer, len(content)))
         
         return qa_pairs
     
+    def _slice_qa_pair(
+        self, 
+        content: str, 
+        question: Tuple[int, int, str], 
+        answer: Tuple[int, int, str], 
+        end_pos: int
+    ) -> tuple:
+        """Build a (question, answer, start, end) tuple from marker offsets."""
+        question_start, question_end, question_marker = question
+        answer_start, answer_end, answer_marker = answer
+        
+        return (
+            f"{question_marker} {content[question_end:answer_start].strip()}",
+            f"{answer_marker} {content[answer_end:end_pos].strip()}",
+            question_start,
+            end_pos
+        )
+    
     def _extract_numbered_questions(self, content: str) -> List[tuple]:
         """Extract numbered questions and following content as answers."""
         qa_pairs = []
         
         # Find numbered questions
-        question_pattern = r'^\d+\.\s*(.+\?)'
-        question_matches = list(re.finditer(question_pattern, content, re.MULTILINE))
+        question_matches = list(_NUMBERED_QUESTION_RE.finditer(content))
         
         for i, match in enumerate(question_matches):
             question = match.group()
@@ -279,83 +415,43 @@ class FAQStrategy(ProcessingStrategy):
         """Extract questions ending with ? and following paragraphs."""
         qa_pairs = []
         
-        # Split content into paragraphs
-        paragraphs = re.split(r'\n\s*\n', content)
+        # Split content into paragraphs, keeping their stripped offsets
+        paragraphs = []
+        previous_end = 0
+        for separator in _PARAGRAPH_SEPARATOR_RE.finditer(content):
+            paragraphs.append(strip_span(content, previous_end, separator.start()))
+            previous_end = separator.end()
+        paragraphs.append(strip_span(content, previous_end, len(content)))
         
-        for i, paragraph in enumerate(paragraphs):
+        for i, (question_start, question_end) in enumerate(paragraphs):
             # Check if paragraph ends with question mark
-            if paragraph.strip().endswith('?'):
-                question = paragraph.strip()
+            if question_end > question_start and content[question_end - 1] == '?':
+                question = content[question_start:question_end]
                 
                 # Look for answer in next paragraph(s)
                 answer_parts = []
+                answer_end = question_end
                 for j in range(i + 1, min(i + 3, len(paragraphs))):  # Check next 2 paragraphs
-                    next_para = paragraphs[j].strip()
-                    if next_para and not next_para.endswith('?'):
-                        answer_parts.append(next_para)
+                    part_start, part_end = paragraphs[j]
+                    if part_end > part_start and content[part_end - 1] != '?':
+                        answer_parts.append(content[part_start:part_end])
+                        answer_end = part_end
                     else:
                         break
                 
                 if answer_parts:
-                    answer = '\n\n'.join(answer_parts)
-                    
-                    # Calculate positions (approximate)
-                    question_pos = content.find(question)
-                    answer_end = question_pos + len(question) + len(answer) + 10
-                    
                     qa_pairs.append((
                         question,
-                        answer,
-                        question_pos,
-                        min(answer_end, len(content))
+                        '\n\n'.join(answer_parts),
+                        question_start,
+                        answer_end
                     ))
         
         return qa_pairs
     
     def _analyze_qa_pair(self, question: str, answer: str) -> Dict[str, Any]:
         """Analyze Q&A pair for metadata extraction."""
-        metadata = {}
-        
-        # Clean question text
-        question_clean = re.sub(r'^(Q:|Question:|Pergunta:)\s*', '', question).strip()
-        metadata["question_clean"] = question_clean
-        
-        # Answer length and complexity
-        metadata["answer_length"] = len(answer)
-        metadata["answer_word_count"] = len(answer.split())
-        
-        # Classify question type
-        if re.search(r'\b(what|o que)\b', question_clean, re.IGNORECASE):
-            metadata["question_type"] = "definition"
-        elif re.search(r'\b(how|como)\b', question_clean, re.IGNORECASE):
-            metadata["question_type"] = "procedure"
-        elif re.search(r'\b(why|por que)\b', question_clean, re.IGNORECASE):
-            metadata["question_type"] = "explanation"
-        elif re.search(r'\b(when|quando)\b', question_clean, re.IGNORECASE):
-            metadata["question_type"] = "timing"
-        elif re.search(r'\b(where|onde)\b', question_clean, re.IGNORECASE):
-            metadata["question_type"] = "location"
-        else:
-            metadata["question_type"] = "general"
-        
-        # Extract topics/keywords
-        topics = []
-        # Simple keyword extraction from question
-        words = re.findall(r'\b[a-zA-Z]{4,}\b', question_clean.lower())
-        topics.extend(words[:5])  # Limit to first 5 words
-        metadata["topics"] = topics
-        
-        # Detect content features
-        metadata["has_links"] = bool(re.search(r'https?://|www\.', answer))
-        metadata["has_examples"] = bool(re.search(r'example|exemplo|for instance', answer, re.IGNORECASE))
-        metadata["has_steps"] = bool(re.search(r'\d+\.\s+|\n\s*[-*]\s+', answer))
-        
-        # Estimate difficulty
-        if len(answer.split()) < 20:
-            metadata["difficulty"] = "basic"
-        elif len(answer.split()) > 100:
-            metadata["difficulty"] = "advanced"
-        else:
-            metadata["difficulty"] = "intermediate"
-        
+        analysis = _analyze_qa_pair(question, answer)
+        metadata = analysis._asdict()
+        metadata["topics"] = list(analysis.topics)
         return metadata
\ No newline at end of file
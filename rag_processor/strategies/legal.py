@@ -5,16 +5,158 @@ Specialized for legal documents with paragraph-based chunking that preserves
 legal structure, article numbering, and clause relationships.
 """
 
+import json
 import re
-from typing import List, Dict, Any
+from functools import lru_cache
+from itertools import chain
+from typing import List, Dict, Any, NamedTuple, Optional
 
 from .base import ProcessingStrategy
 from ..utils.directive_parser import ProcessingDirective
-from ..utils.text_utils import ChunkMetadata, TextChunker
+from ..utils.text_utils import ChunkMetadata, TextChunker, at_least, strip_span
 from ..clients.base import ClientConfig
 from config.constants import LEGAL_CHUNK_OVERLAP
 
 
+# Indicators that content is a legal document
+_LEGAL_INDICATOR_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in [
+        r'Article\s+\d+|Artigo\s+\d+',
+        r'Section\s+\d+|Seção\s+\d+',
+        r'whereas|considerando',
+        r'hereby|pelo\s+presente',
+        r'Terms\s+and\s+Conditions',
+        r'Privacy\s+Policy',
+        r'Agreement|Acordo',
+        r'Contract|Contrato',
+        r'shall|deve|deverá',
+        r'party|parte',
+        r'clause|cláusula',
+    ]
+]
+_PARAGRAPH_SEPARATOR_RE = re.compile(r'\n\s*\n')
+_NUMBERED_SECTION_RE = re.compile(r'^\s*\d+\.', re.MULTILINE)
+
+# Patterns for legal sections, tried in order
+_SECTION_PATTERNS = [
+    re.compile(pattern, re.MULTILINE | re.IGNORECASE)
+    for pattern in [
+        r'^(Article\s+\d+|Artigo\s+\d+)[:\-\s]*(.*)$',
+        r'^(Section\s+\d+|Seção\s+\d+)[:\-\s]*(.*)$',
+        r'^(\d+\.\d*)[:\-\s]*(.*)$',
+        r'^([A-Z][A-Z\s]{5,30})\s*$',  # ALL CAPS section headers
+    ]
+]
+_SUBSECTION_RE = re.compile(r'^\s*\d+\.\d+\s+', re.MULTILINE)
+
+# Legal content analysis patterns, written in lowercase: ASCII text is
+# lowercased once and scanned case-sensitively, which is cheaper than
+# IGNORECASE matching; other text uses the IGNORECASE twins below.
+# Whole-word matches of different legal terms cannot overlap, so one
+# alternation counts exactly what a separate scan per term would. The
+# feature probes are kept as separate searches, each of which stops at its
+# first hit; a single named-group alternation was slower and would let one
+# probe consume another's match (e.g. "shall mean" hiding "shall")
+_ANALYSIS_PATTERNS = {
+    "legal_term": re.compile(r'\b(?:shall|may|must|hereby|whereas|therefore|party|agreement)\b'),
+    "cross_reference": re.compile(r'section\s+\d+|article\s+\d+|paragraph\s+\d+'),
+    "definition": re.compile(r'means|shall mean|defined as'),
+    "obligation": re.compile(r'shall|must|required to'),
+    "monetary_amount": re.compile(r'\$[\d,]+|\d+\s*(?:dollars?|euros?|reais?)'),
+}
+_ANALYSIS_IGNORECASE_PATTERNS = {
+    name: re.compile(pattern.pattern, re.IGNORECASE) for name, pattern in _ANALYSIS_PATTERNS.items()
+}
+_DATE_RE = re.compile(r'\d{1,2}[\/\-]\d{1,2}[\/\-]\d{2,4}')
+
+# Template metadata before client fields are merged in; copied per call
+_TEMPLATE_METADATA_BASE = {
+    "type": "legal-document",
+    "version": "1.0",
+    "structure": "legal",
+}
+
+# Example content appended after the template header
+_TEMPLATE_BODY = """
+# Legal Document Template
+
+## Article 1 - Definitions
+
+For the purposes of this agreement, the following terms shall have the meanings set forth below:
+
+1.1 "Party" means each individual or entity that is a signatory to this agreement.
+
+1.2 "Services" means the services to be provided under this agreement as described herein.
+
+## Article 2 - Scope of Agreement
+
+This agreement governs the relationship between the parties with respect to the subject matter described herein. The parties agree to be bound by the terms and conditions set forth in this document.
+
+## Article 3 - Obligations
+
+3.1 Each party shall perform its obligations under this agreement in good faith and in accordance with applicable law.
+
+3.2 The parties acknowledge that time is of the essence in the performance of their respective obligations.
+
+## Article 4 - Term and Termination
+
+4.1 This agreement shall commence on the date of execution and shall continue for a period of one (1) year unless terminated earlier in accordance with the provisions hereof.
+
+4.2 Either party may terminate this agreement upon thirty (30) days written notice to the other party.
+
+# Continue adding articles and clauses following proper legal document structure."""
+
+
+class _LegalSection(NamedTuple):
+    """An article, section or heading found in a legal document."""
+    
+    text: str
+    title: str
+    subtitle: str
+    start_pos: int
+    end_pos: int
+    section_type: str
+
+
+class _LegalTextAnalysis(NamedTuple):
+    """Metadata extracted from legal text."""
+    
+    legal_term_count: int
+    has_cross_references: bool
+    has_definitions: bool
+    has_obligations: bool
+    has_dates: bool
+    has_monetary_amounts: bool
+
+
+@lru_cache(maxsize=1024)
+def _analyze_legal_text(text: str) -> _LegalTextAnalysis:
+    """
+    Analyze legal text for metadata.
+    
+    Memoized on the text, since boilerplate clauses recur across
+    contracts and policies.
+    """
+    # Lowercasing only preserves matches for ASCII text
+    if text.isascii():
+        folded, patterns = text.lower(), _ANALYSIS_PATTERNS
+    else:
+        folded, patterns = text, _ANALYSIS_IGNORECASE_PATTERNS
+    
+    return _LegalTextAnalysis(
+        # Count legal terms
+        legal_term_count=len(patterns["legal_term"].findall(folded)),
+        # Detect references
+        has_cross_references=bool(patterns["cross_reference"].search(folded)),
+        has_definitions=bool(patterns["definition"].search(folded)),
+        has_obligations=bool(patterns["obligation"].search(folded)),
+        # Detect dates and numbers
+        has_dates=bool(_DATE_RE.search(text)),
+        has_monetary_amounts=bool(patterns["monetary_amount"].search(folded))
+    )
+
+
 class LegalStrategy(ProcessingStrategy):
     """
     Legal document processing strategy.
@@ -23,25 +165,10 @@ class LegalStrategy(ProcessingStrategy):
     article numbering, and maintaining clause relationships.
     """
     
-    @property
-    def name(self) -> str:
-        """Strategy name in format 'category/method'."""
-        return "legal/paragraph-based"
-    
-    @property
-    def description(self) -> str:
-        """Human-readable description of the strategy."""
-        return "Legal document chunking at paragraph boundaries with structure preservation"
-    
-    @property
-    def default_chunk_pattern(self) -> str:
-        """Default regex pattern for legal paragraph boundaries."""
-        return r'\n\n+'  # Double newlines indicate paragraph breaks
-    
-    @property
-    def default_overlap(self) -> int:
-        """Default character overlap between chunks."""
-        return LEGAL_CHUNK_OVERLAP
+    name = "legal/paragraph-based"
+    description = "Legal document chunking at paragraph boundaries with structure preservation"
+    default_chunk_pattern = r'\n\n+'  # Double newlines indicate paragraph breaks
+    default_overlap = LEGAL_CHUNK_OVERLAP
     
     def process(
         self, 
@@ -60,7 +187,6 @@ class LegalStrategy(ProcessingStrategy):
         Returns:
             List[ChunkMetadata]: List of legal chunks with metadata
         """
-        chunker = TextChunker()
         overlap = self.get_overlap(directive)
         
         # Use specialized legal chunking
@@ -68,6 +194,7 @@ class LegalStrategy(ProcessingStrategy):
         
         if not chunks:
             # Fallback to paragraph-based chunking
+            chunker = TextChunker()
             return chunker.chunk_by_pattern(content, r'\n\s*\n', overlap)
         
         return chunks
@@ -85,37 +212,21 @@ class LegalStrategy(ProcessingStrategy):
         """
         issues = []
         
-        # Check for legal document indicators
-        legal_indicators = [
-            r'Article\s+\d+|Artigo\s+\d+',
-            r'Section\s+\d+|Seção\s+\d+',
-            r'whereas|considerando',
-            r'hereby|pelo\s+presente',
-            r'Terms\s+and\s+Conditions',
-            r'Privacy\s+Policy',
-            r'Agreement|Acordo',
-            r'Contract|Contrato',
-            r'shall|deve|deverá',
-            r'party|parte',
-            r'clause|cláusula',
-        ]
-        
-        indicator_matches = 0
-        for pattern in legal_indicators:
-            matches = len(re.findall(pattern, content, re.IGNORECASE))
-            indicator_matches += matches
+        # Check for legal document indicators; scanning stops once enough matches are found
+        indicator_matches = chain.from_iterable(
+            pattern.finditer(content) for pattern in _LEGAL_INDICATOR_PATTERNS
+        )
         
-        if indicator_matches < 3:
+        if not at_least(indicator_matches, 3):
             issues.append("Content doesn't appear to be legal document format")
         
-        # Check paragraph structure
-        paragraph_count = len(re.split(r'\n\s*\n', content))
-        if paragraph_count < 5:
+        # Check paragraph structure; five paragraphs need only four separators,
+        # so the scan stops there instead of splitting the whole document
+        if not at_least(_PARAGRAPH_SEPARATOR_RE.finditer(content), 4):
             issues.append("Very few paragraphs detected - may not be suitable for paragraph-based chunking")
         
         # Check for numbered sections/articles
-        numbered_sections = len(re.findall(r'^\s*\d+\.', content, re.MULTILINE))
-        if numbered_sections == 0:
+        if _NUMBERED_SECTION_RE.search(content) is None:
             issues.append("No numbered sections detected - legal structure may be unclear")
         
         return issues
@@ -142,14 +253,9 @@ class LegalStrategy(ProcessingStrategy):
         ]
         
         # Add metadata
-        metadata = {
-            "type": "legal-document",
-            "version": "1.0",
-            "structure": "legal",
-        }
+        metadata = _TEMPLATE_METADATA_BASE.copy()
         metadata.update(client_metadata)
         
-        import json
         template_parts.append(f"#!metadata: {json.dumps(metadata, separators=(',', ':'))}")
         
         # Add custom rules
@@ -157,39 +263,9 @@ class LegalStrategy(ProcessingStrategy):
         if custom_rules:
             template_parts.append(f"#!custom-rules: {json.dumps(custom_rules, separators=(',', ':'))}")
         
-        # Add example content
-        template_parts.extend([
-            "",
-            "# Legal Document Template",
-            "",
-            "## Article 1 - Definitions",
-            "",
-            "For the purposes of this agreement, the following terms shall have the meanings set forth below:",
-            "",
-            "1.1 \"Party\" means each individual or entity that is a signatory to this agreement.",
-            "",
-            "1.2 \"Services\" means the services to be provided under this agreement as described herein.",
-            "",
-            "## Article 2 - Scope of Agreement",
-            "",
-            "This agreement governs the relationship between the parties with respect to the subject matter described herein. The parties agree to be bound by the terms and conditions set forth in this document.",
-            "",
-            "## Article 3 - Obligations",
-            "",
-            "3.1 Each party shall perform its obligations under this agreement in good faith and in accordance with applicable law.",
-            "",
-            "3.2 The parties acknowledge that time is of the essence in the performance of their respective obligations.",
-            "",
-            "## Article 4 - Term and Termination",
-            "",
-            "4.1 This agreement shall commence on the date of execution and shall continue for a period of one (1) year unless terminated earlier in accordance with the provisions hereof.",
-            "",
-            "4.2 Either party may terminate this agreement upon thirty (30) days written notice to the other party.",
-            "",
-            "# Continue adding articles and clauses following proper legal document structure.",
-        ])
-        
-        return '\n'.join(template_parts)
+        # Append the static example content
+        header = '\n'.join(template_parts)
+        return f"{header}\n{_TEMPLATE_BODY}"
     
     def _chunk_by_legal_structure(self, content: str, overlap: int, client_config: ClientConfig) -> List[ChunkMetadata]:
         """
@@ -216,53 +292,50 @@ class LegalStrategy(ProcessingStrategy):
         
         return chunks
     
-    def _extract_legal_sections(self, content: str) -> List[Dict[str, Any]]:
+    def _extract_legal_sections(self, content: str) -> List[_LegalSection]:
         """Extract legal sections/articles from content."""
         sections = []
         
-        # Patterns for legal sections
-        section_patterns = [
-            r'^(Article\s+\d+|Artigo\s+\d+)[:\-\s]*(.*)$',
-            r'^(Section\s+\d+|Seção\s+\d+)[:\-\s]*(.*)$',
-            r'^(\d+\.\d*)[:\-\s]*(.*)$',
-            r'^([A-Z][A-Z\s]{5,30})\s*$',  # ALL CAPS section headers
-        ]
-        
-        for pattern in section_patterns:
-            matches = list(re.finditer(pattern, content, re.MULTILINE | re.IGNORECASE))
+        for pattern in _SECTION_PATTERNS:
+            # Walk matches one ahead, so only the current and next are live
+            matches = pattern.finditer(content)
+            match = next(matches, None)
             
-            if matches:
-                for i, match in enumerate(matches):
+            if match is not None:
+                while match is not None:
+                    next_match = next(matches, None)
                     section_start = match.start()
                     
                     # Find section end (next section or end of document)
-                    if i < len(matches) - 1:
-                        section_end = matches[i + 1].start()
+                    if next_match is not None:
+                        section_end = next_match.start()
                     else:
                         section_end = len(content)
                     
                     section_text = content[section_start:section_end].strip()
                     
                     if len(section_text) > 100:  # Only include substantial sections
-                        sections.append({
-                            "text": section_text,
-                            "title": match.group(1).strip(),
-                            "subtitle": match.group(2).strip() if len(match.groups()) > 1 else "",
-                            "start_pos": section_start,
-                            "end_pos": section_end,
-                            "section_type": self._classify_legal_section(section_text),
-                        })
+                        sections.append(_LegalSection(
+                            text=section_text,
+                            title=match.group(1).strip(),
+                            subtitle=match.group(2).strip() if len(match.groups()) > 1 else "",
+                            start_pos=section_start,
+                            end_pos=section_end,
+                            section_type=self._classify_legal_section(section_text),
+                        ))
+                    
+                    match = next_match
                 
                 break  # Use first pattern that finds sections
         
         return sections
     
-    def _process_legal_sections(self, sections: List[Dict], overlap: int) -> List[ChunkMetadata]:
+    def _process_legal_sections(self, sections: List[_LegalSection], overlap: int) -> List[ChunkMetadata]:
         """Process legal sections into chunks."""
         chunks = []
         
         for i, section in enumerate(sections):
-            section_text = section["text"]
+            section_text = section.text
             
             # For large sections, split into subsections
             if len(section_text) > 2000:
@@ -275,9 +348,9 @@ class LegalStrategy(ProcessingStrategy):
                 chunk_metadata = {
                     "strategy": self.name,
                     "chunk_index": len(chunks),
-                    "section_title": section["title"],
-                    "section_subtitle": section["subtitle"],
-                    "section_type": section["section_type"],
+                    "section_title": section.title,
+                    "section_subtitle": section.subtitle,
+                    "section_type": section.section_type,
                     "chunking_method": "legal-section",
                     **legal_metadata
                 }
@@ -285,8 +358,8 @@ class LegalStrategy(ProcessingStrategy):
                 chunk = ChunkMetadata(
                     text=section_text,
                     metadata=chunk_metadata,
-                    start_position=section["start_pos"],
-                    end_position=section["end_pos"]
+                    start_position=section.start_pos,
+                    end_position=section.end_pos
                 )
                 
                 chunks.append(chunk)
@@ -296,19 +369,26 @@ class LegalStrategy(ProcessingStrategy):
     def _process_paragraphs(self, content: str, overlap: int) -> List[ChunkMetadata]:
         """Process content as paragraphs when no legal structure is found."""
         chunks = []
-        paragraphs = re.split(r'\n\s*\n', content)
+        
+        # Split into paragraphs, tracking their offsets without surrounding whitespace
+        paragraph_spans = []
+        previous_end = 0
+        for separator in _PARAGRAPH_SEPARATOR_RE.finditer(content):
+            paragraph_spans.append(strip_span(content, previous_end, separator.start()))
+            previous_end = separator.end()
+        paragraph_spans.append(strip_span(content, previous_end, len(content)))
         
         current_chunk_paras = []
         current_size = 0
         target_size = 1500
-        position = 0
+        chunk_start = 0
+        chunk_end = 0
         
-        for paragraph in paragraphs:
-            paragraph = paragraph.strip()
-            if not paragraph:
+        for para_start, para_end in paragraph_spans:
+            if para_start == para_end:
                 continue
             
-            para_size = len(paragraph)
+            para_size = para_end - para_start
             
             # Check if adding paragraph exceeds target size
             if current_chunk_paras and current_size + para_size > target_size:
@@ -326,8 +406,8 @@ class LegalStrategy(ProcessingStrategy):
                 chunk = ChunkMetadata(
                     text=chunk_text,
                     metadata=chunk_metadata,
-                    start_position=position - current_size,
-                    end_position=position
+                    start_position=chunk_start,
+                    end_position=chunk_end
                 )
                 
                 chunks.append(chunk)
@@ -336,9 +416,12 @@ class LegalStrategy(ProcessingStrategy):
                 current_chunk_paras = []
                 current_size = 0
             
-            current_chunk_paras.append(paragraph)
+            if not current_chunk_paras:
+                chunk_start = para_start
+            
+            current_chunk_paras.append(content[para_start:para_end])
             current_size += para_size
-            position += para_size + 2  # +2 for paragraph separator
+            chunk_end = para_end
         
         # Add final chunk
         if current_chunk_paras:
@@ -355,34 +438,41 @@ class LegalStrategy(ProcessingStrategy):
             chunk = ChunkMetadata(
                 text=chunk_text,
                 metadata=chunk_metadata,
-                start_position=position - current_size,
-                end_position=position
+                start_position=chunk_start,
+                end_position=chunk_end
             )
             
             chunks.append(chunk)
         
         return chunks
     
-    def _split_large_legal_section(self, section: Dict, overlap: int) -> List[ChunkMetadata]:
+    def _split_large_legal_section(self, section: _LegalSection, overlap: int) -> List[ChunkMetadata]:
         """Split large legal sections into smaller chunks."""
-        text = section["text"]
+        text = section.text
         chunks = []
         
-        # Try to split by subsections first
-        subsection_pattern = r'^\s*\d+\.\d+\s+'
-        subsections = re.split(subsection_pattern, text, flags=re.MULTILINE)
+        # Try to split by subsections first, keeping the offsets of the text
+        # between subsection markers
+        subsection_spans = []
+        previous_end = 0
+        for marker in _SUBSECTION_RE.finditer(text):
+            subsection_spans.append((previous_end, marker.start()))
+            previous_end = marker.end()
+        subsection_spans.append((previous_end, len(text)))
         
-        if len(subsections) > 1:
+        if len(subsection_spans) > 1:
             # Process as subsections
-            position = section["start_pos"]
-            for i, subsection_text in enumerate(subsections):
-                if not subsection_text.strip():
+            for i, (subsection_start, subsection_end) in enumerate(subsection_spans):
+                subsection_start, subsection_end = strip_span(text, subsection_start, subsection_end)
+                if subsection_start == subsection_end:
                     continue
                 
+                subsection_text = text[subsection_start:subsection_end]
+                
                 chunk_metadata = {
                     "strategy": self.name,
                     "chunk_index": len(chunks),
-                    "section_title": section["title"],
+                    "section_title": section.title,
                     "subsection_index": i,
                     "is_subsection": True,
                     "chunking_method": "legal-subsection",
@@ -390,14 +480,13 @@ class LegalStrategy(ProcessingStrategy):
                 }
                 
                 chunk = ChunkMetadata(
-                    text=subsection_text.strip(),
+                    text=subsection_text,
                     metadata=chunk_metadata,
-                    start_position=position,
-                    end_position=position + len(subsection_text)
+                    start_position=section.start_pos + subsection_start,
+                    end_position=section.start_pos + subsection_end
                 )
                 
                 chunks.append(chunk)
-                position += len(subsection_text)
         else:
             # Split by paragraphs within section
             paragraphs = text.split('\n\n')
@@ -412,7 +501,7 @@ class LegalStrategy(ProcessingStrategy):
                     chunk_metadata = {
                         "strategy": self.name,
                         "chunk_index": len(chunks),
-                        "section_title": section["title"],
+                        "section_title": section.title,
                         "section_part": f"Part {len(chunks) + 1}",
                         "chunking_method": "legal-section-split",
                         **self._analyze_legal_content(chunk_text, section)
@@ -421,8 +510,8 @@ class LegalStrategy(ProcessingStrategy):
                     chunk = ChunkMetadata(
                         text=chunk_text,
                         metadata=chunk_metadata,
-                        start_position=section["start_pos"],
-                        end_position=section["start_pos"] + len(chunk_text)
+                        start_position=section.start_pos,
+                        end_position=section.start_pos + len(chunk_text)
                     )
                     
                     chunks.append(chunk)
@@ -439,7 +528,7 @@ class LegalStrategy(ProcessingStrategy):
                 chunk_metadata = {
                     "strategy": self.name,
                     "chunk_index": len(chunks),
-                    "section_title": section["title"],
+                    "section_title": section.title,
                     "section_part": f"Part {len(chunks) + 1}",
                     "chunking_method": "legal-section-split",
                     **self._analyze_legal_content(chunk_text, section)
@@ -448,8 +537,8 @@ class LegalStrategy(ProcessingStrategy):
                 chunk = ChunkMetadata(
                     text=chunk_text,
                     metadata=chunk_metadata,
-                    start_position=section["start_pos"],
-                    end_position=section["end_pos"]
+                    start_position=section.start_pos,
+                    end_position=section.end_pos
                 )
                 
                 chunks.append(chunk)
@@ -460,6 +549,9 @@ class LegalStrategy(ProcessingStrategy):
         """Classify the type of legal section."""
         text_lower = text.lower()
         
+        # Categories are checked in priority order. The C-level substring
+        # tests beat a single alternation scan, which would also report the
+        # leftmost keyword rather than the highest-priority category
         if any(word in text_lower for word in ["definition", "definição", "meaning"]):
             return "definitions"
         elif any(word in text_lower for word in ["obligation", "obrigação", "duty", "dever"]):
@@ -477,25 +569,12 @@ class LegalStrategy(ProcessingStrategy):
         else:
             return "general"
     
-    def _analyze_legal_content(self, text: str, section: Dict = None) -> Dict[str, Any]:
+    def _analyze_legal_content(self, text: str, section: Optional[_LegalSection] = None) -> Dict[str, Any]:
         """Analyze legal content for metadata."""
-        analysis = {}
-        
-        # Count legal terms
-        legal_terms = ["shall", "may", "must", "hereby", "whereas", "therefore", "party", "agreement"]
-        analysis["legal_term_count"] = sum(len(re.findall(f'\\b{term}\\b', text, re.IGNORECASE)) for term in legal_terms)
-        
-        # Detect references
-        analysis["has_cross_references"] = bool(re.search(r'Section\s+\d+|Article\s+\d+|paragraph\s+\d+', text, re.IGNORECASE))
-        analysis["has_definitions"] = bool(re.search(r'means|shall mean|defined as', text, re.IGNORECASE))
-        analysis["has_obligations"] = bool(re.search(r'shall|must|required to', text, re.IGNORECASE))
-        
-        # Detect dates and numbers
-        analysis["has_dates"] = bool(re.search(r'\d{1,2}[\/\-]\d{1,2}[\/\-]\d{2,4}', text))
-        analysis["has_monetary_amounts"] = bool(re.search(r'\$[\d,]+|\d+\s*(?:dollars?|euros?|reais?)', text, re.IGNORECASE))
+        analysis = _analyze_legal_text(text)._asdict()
         
         # Section classification
-        if section:
-            analysis["section_type"] = section.get("section_type", "general")
+        if section is not None:
+            analysis["section_type"] = section.section_type
         
         return analysis
\ No newline at end of file
@@ -6,16 +6,94 @@ to preserve product integrity. Based on proven success with
 Studio Camila Golin's product catalog.
 """
 
+import json
 import re
-from typing import List, Dict, Any
+from functools import partial
+from typing import List, Dict, Any, NamedTuple
 
 from .base import ProcessingStrategy
 from ..utils.directive_parser import ProcessingDirective
-from ..utils.text_utils import ChunkMetadata, TextChunker
+from ..utils.text_utils import ChunkMetadata, TextChunker, at_least, strip_span
 from ..clients.base import ClientConfig
 from config.constants import PRODUCTS_CHUNK_OVERLAP
 
 
+# Field labels that mark product entries; each ends with the only colon it
+# contains, so one alternation counts exactly what a scan per label would
+_PRODUCT_INDICATOR_RE = re.compile(r'Nome:|Produto:|Item:|Categoria:|Preço:|Descrição:', re.IGNORECASE)
+# The same labels for ASCII text, where lowercasing is exact and the
+# accented labels cannot occur, so plain substring counts suffice
+_ASCII_PRODUCT_INDICATORS = ("nome:", "produto:", "item:", "categoria:")
+
+# Product fields extracted into chunk metadata
+_FIELD_PATTERNS = {
+    field_name: re.compile(pattern, re.IGNORECASE)
+    for field_name, pattern in {
+        "categoria": r'Categoria:\s*(?P<value>[^\n]+)',
+        "description": r'Descrição:\s*(?P<value>[^\n]+)',
+        "price": r'(?:Preço|Valor):\s*(?P<value>[^\n]+)',
+        "brand": r'Marca:\s*(?P<value>[^\n]+)',
+        "model": r'Modelo:\s*(?P<value>[^\n]+)',
+    }.items()
+}
+
+# All product fields in one scan. The labels cannot overlap one another
+# and each ends with a colon, so a value without a colon hides no field
+_PRODUCT_FIELD_RE = re.compile(
+    r'(?P<label>Categoria|Descrição|Preço|Valor|Marca|Modelo):\s*(?P<value>[^\n]+)', re.IGNORECASE
+)
+_FIELD_NAME_BY_LABEL = {
+    "categoria": "categoria",
+    "descrição": "description",
+    "preço": "price",
+    "valor": "price",
+    "marca": "brand",
+    "modelo": "model",
+}
+
+# Core English boundary patterns tried after the chunk pattern
+# (case insensitive, allows empty values)
+_CORE_BOUNDARY_PATTERNS = [
+    re.compile(pattern, re.MULTILINE)
+    for pattern in [
+        r'(?i)Description:\s*([^\n]*)',           # Description field
+        r'(?i)Price:\s*([^\n]*)',                 # Price field
+        r'(?i)Product:\s*([^\n]*)',               # Alternative product field
+        r'(?i)Item:\s*([^\n]*)',                  # Item field
+    ]
+]
+
+# Fallback boundary detection patterns
+_BLANK_LINE_SEPARATOR_RE = re.compile(r'\n\s*\n')
+_FIELD_LINE_RE = re.compile(r'(?i)^([a-zA-Z][a-zA-Z\s]*?):\s*([^\n]*)', re.MULTILINE)
+
+_COMPACT_JSON_ENCODER = json.JSONEncoder(separators=(',', ':'))
+
+# Example content appended after the template header
+_TEMPLATE_BODY = """
+# Product Catalog Template
+
+Nome: Exemplo de Produto 1
+Categoria: Categoria Exemplo
+Descrição: Descrição detalhada do produto com características principais.
+Preço: R$ 99,99
+
+Nome: Exemplo de Produto 2
+Categoria: Categoria Exemplo
+Descrição: Outra descrição de produto com detalhes específicos.
+Preço: R$ 149,90
+
+# Add your products following the same structure above.
+# Each product should start with 'Nome:' followed by the product details."""
+
+
+class _ProductBoundary(NamedTuple):
+    """Start of a product entry found by boundary detection."""
+    start: int
+    name: str           # Captured product name, 'Unknown' if none
+    marker: str         # Text that marked the boundary
+
+
 class ProductsStrategy(ProcessingStrategy):
     """
     Product catalog processing strategy.
@@ -24,25 +102,10 @@ class ProductsStrategy(ProcessingStrategy):
     preventing the fragmentation issues that cause poor RAG performance.
     """
     
-    @property
-    def name(self) -> str:
-        """Strategy name in format 'category/method'."""
-        return "products/semantic-boundary"
-    
-    @property
-    def description(self) -> str:
-        """Human-readable description of the strategy."""
-        return "Product catalog chunking at semantic boundaries to preserve product integrity"
-    
-    @property
-    def default_chunk_pattern(self) -> str:
-        """Default regex pattern for product boundaries."""
-        return r'(?i)Name:\s*([^\n]*)'  # Matches "Name: Product Name" (case insensitive, allows empty)
-    
-    @property
-    def default_overlap(self) -> int:
-        """Default character overlap between chunks."""
-        return PRODUCTS_CHUNK_OVERLAP  # No overlap for semantic boundaries
+    name = "products/semantic-boundary"
+    description = "Product catalog chunking at semantic boundaries to preserve product integrity"
+    default_chunk_pattern = r'(?i)Name:\s*([^\n]*)'  # Matches "Name: Product Name" (case insensitive, allows empty)
+    default_overlap = PRODUCTS_CHUNK_OVERLAP  # No overlap for semantic boundaries
     
     def process(
         self, 
@@ -66,60 +129,45 @@ class ProductsStrategy(ProcessingStrategy):
         overlap = self.get_overlap(directive)
         
         # Use intelligent boundary detection - try multiple core patterns
-        product_matches = self._find_product_boundaries(content, pattern)
+        boundaries = self._find_product_boundaries(content, pattern)
         
-        if not product_matches:
+        if not boundaries:
             # Fallback to alternative detection methods
-            product_matches = self._fallback_boundary_detection(content)
+            boundaries = self._fallback_boundary_detection(content)
         
-        if not product_matches:
+        if not boundaries:
             # No product patterns found - use fallback chunking
             return chunker.chunk_by_size(content, 1000, overlap)
         
         chunks = []
         
-        for i, match in enumerate(product_matches):
+        for i, boundary in enumerate(boundaries):
             # Determine chunk boundaries
-            start_pos = match.start()
+            start_pos = boundary.start
             
-            if i < len(product_matches) - 1:
-                end_pos = product_matches[i + 1].start()
+            if i < len(boundaries) - 1:
+                end_pos = boundaries[i + 1].start
             else:
                 end_pos = len(content)
             
-            # Extract product text
-            product_text = content[start_pos:end_pos].strip()
-            
-            # Skip empty or very short products
-            if len(product_text) < 50:
+            # Skip empty or very short products, measured on offsets before slicing
+            product_start, product_end = strip_span(content, start_pos, end_pos)
+            if product_end - product_start < 50:
                 continue
             
-            # Extract product metadata
-            product_metadata = self._extract_product_metadata(product_text, match)
-            
-            # Validate product completeness if client requires it
-            validation_issues = []
-            if hasattr(client_config, 'validate_product_completeness'):
-                validation_issues = client_config.validate_product_completeness(product_text)
+            # Extract product text
+            product_text = content[product_start:product_end]
             
             # Create chunk with rich metadata
-            chunk_metadata = {
-                "strategy": self.name,
-                "chunk_index": len(chunks),
-                "product_name": product_metadata.get("name", "Unknown"),
-                "product_category": product_metadata.get("category"),
-                "has_price": product_metadata.get("has_price", False),
-                "validation_issues": validation_issues,
-                "product_fields": product_metadata.get("fields", []),
-                "chunking_method": "semantic-boundary",
-                "boundary_pattern": match.group(),
-            }
-            
-            chunk = ChunkMetadata(
-                text=product_text,
-                metadata=chunk_metadata,
-                start_position=start_pos,
-                end_position=end_pos
+            chunk = self.create_chunk(
+                product_text,
+                partial(
+                    self._build_product_chunk_metadata,
+                    product_text, boundary.name, boundary.marker, client_config, len(chunks)
+                ),
+                start_pos,
+                end_pos,
+                client_config.lazy_metadata
             )
             
             chunks.append(chunk)
@@ -148,10 +196,15 @@ class ProductsStrategy(ProcessingStrategy):
             issues.append("Very few products detected - consider different strategy")
         
         # Check for incomplete products
-        product_indicators = ["Nome:", "Produto:", "Item:", "Categoria:", "Preço:", "Descrição:"]
-        indicator_count = sum(len(re.findall(indicator, content, re.IGNORECASE)) for indicator in product_indicators)
+        required_indicators = len(product_matches) * 2
+        if content.isascii():
+            lowered = content.lower()
+            indicator_count = sum(lowered.count(label) for label in _ASCII_PRODUCT_INDICATORS)
+            has_indicators = indicator_count >= required_indicators
+        else:
+            has_indicators = at_least(_PRODUCT_INDICATOR_RE.finditer(content), required_indicators)
         
-        if indicator_count < len(product_matches) * 2:
+        if not has_indicators:
             issues.append("Products appear incomplete - missing key fields")
         
         return issues
@@ -185,132 +238,155 @@ class ProductsStrategy(ProcessingStrategy):
         }
         metadata.update(client_metadata)
         
-        import json
-        template_parts.append(f"#!metadata: {json.dumps(metadata, separators=(',', ':'))}")
+        template_parts.append(f"#!metadata: {_COMPACT_JSON_ENCODER.encode(metadata)}")
         
         # Add custom rules if client provides them
         custom_rules = client_config.customize_strategy_config(self.name)
         if custom_rules:
-            template_parts.append(f"#!custom-rules: {json.dumps(custom_rules, separators=(',', ':'))}")
-        
-        # Add example content
-        template_parts.extend([
-            "",
-            "# Product Catalog Template",
-            "",
-            "Nome: Exemplo de Produto 1",
-            "Categoria: Categoria Exemplo",
-            "Descrição: Descrição detalhada do produto com características principais.",
-            "Preço: R$ 99,99",
-            "",
-            "Nome: Exemplo de Produto 2", 
-            "Categoria: Categoria Exemplo",
-            "Descrição: Outra descrição de produto com detalhes específicos.",
-            "Preço: R$ 149,90",
-            "",
-            "# Add your products following the same structure above.",
-            "# Each product should start with 'Nome:' followed by the product details.",
-        ])
-        
-        return '\n'.join(template_parts)
+            template_parts.append(f"#!custom-rules: {_COMPACT_JSON_ENCODER.encode(custom_rules)}")
+        
+        # Append the static example content
+        header = '\n'.join(template_parts)
+        return f"{header}\n{_TEMPLATE_BODY}"
     
-    def _extract_product_metadata(self, product_text: str, name_match: re.Match) -> Dict[str, Any]:
+    def _build_product_chunk_metadata(
+        self, 
+        product_text: str, 
+        product_name: str, 
+        boundary_pattern: str, 
+        client_config: ClientConfig,
+        chunk_index: int
+    ) -> Dict[str, Any]:
+        """Build the metadata dict for a product chunk."""
+        # Extract product metadata
+        product_metadata = self._extract_product_metadata(product_text, product_name)
+        
+        # Validate product completeness if client requires it
+        validation_issues = []
+        if hasattr(client_config, 'validate_product_completeness'):
+            validation_issues = client_config.validate_product_completeness(product_text)
+        
+        return {
+            "strategy": self.name,
+            "chunk_index": chunk_index,
+            "product_name": product_metadata.get("name", "Unknown"),
+            "product_category": product_metadata.get("category"),
+            "has_price": product_metadata.get("has_price", False),
+            "validation_issues": validation_issues,
+            "product_fields": product_metadata.get("fields", []),
+            "chunking_method": "semantic-boundary",
+            "boundary_pattern": boundary_pattern,
+        }
+    
+    def _extract_product_metadata(self, product_text: str, product_name: str) -> Dict[str, Any]:
         """
         Extract metadata from product text.
         
         Args:
             product_text (str): Product text content
-            name_match (re.Match): Regex match for product name
+            product_name (str): Product name from the boundary match
             
         Returns:
             Dict[str, Any]: Product metadata
         """
-        metadata = {
-            "name": name_match.group(1).strip() if len(name_match.groups()) > 0 else "Unknown",
+        metadata: Dict[str, Any] = {
+            "name": product_name,
             "fields": [],
             "has_price": False,
         }
         
         # Extract common product fields
-        field_patterns = {
-            "categoria": r'Categoria:\s*([^\n]+)',
-            "description": r'Descrição:\s*([^\n]+)',
-            "price": r'(?:Preço|Valor):\s*([^\n]+)',
-            "brand": r'Marca:\s*([^\n]+)',
-            "model": r'Modelo:\s*([^\n]+)',
-        }
-        
-        for field_name, pattern in field_patterns.items():
-            match = re.search(pattern, product_text, re.IGNORECASE)
+        field_matches = self._find_product_fields(product_text)
+        for field_name in _FIELD_PATTERNS:
+            match = field_matches.get(field_name)
             if match:
                 metadata["fields"].append(field_name)
                 if field_name == "categoria":
-                    metadata["category"] = match.group(1).strip()
+                    metadata["category"] = match.group("value").strip()
                 elif field_name == "price":
                     metadata["has_price"] = True
-                    metadata["price"] = match.group(1).strip()
+                    metadata["price"] = match.group("value").strip()
         
         return metadata
     
-    def _find_product_boundaries(self, content: str, primary_pattern: str) -> List[re.Match]:
+    def _find_product_fields(self, product_text: str) -> Dict[str, re.Match]:
+        """
+        Find the first match of each product field.
+        
+        A single scan finds every field; when a value contains a colon, and
+        so may hide another field label, each field is searched separately.
+        
+        Args:
+            product_text (str): Product text content
+            
+        Returns:
+            Dict[str, re.Match]: First match of each field found, by field name
+        """
+        field_matches: Dict[str, re.Match] = {}
+        
+        for match in _PRODUCT_FIELD_RE.finditer(product_text):
+            field_name = _FIELD_NAME_BY_LABEL.get(match.group("label").casefold())
+            if field_name is None or ':' in match.group("value"):
+                field_matches = {}
+                for field_name, pattern in _FIELD_PATTERNS.items():
+                    field_match = pattern.search(product_text)
+                    if field_match:
+                        field_matches[field_name] = field_match
+                break
+            field_matches.setdefault(field_name, match)
+        
+        return field_matches
+    
+    def _find_product_boundaries(self, content: str, primary_pattern: str) -> List[_ProductBoundary]:
         """
         Find product boundaries using flexible pattern matching.
         
         Tries multiple core patterns to detect product boundaries.
         """
-        # Core English patterns (case insensitive, allows empty values)
-        core_patterns = [
-            primary_pattern,                           # Usually Name: pattern
-            r'(?i)Description:\s*([^\n]*)',           # Description field
-            r'(?i)Price:\s*([^\n]*)',                 # Price field
-            r'(?i)Product:\s*([^\n]*)',               # Alternative product field
-            r'(?i)Item:\s*([^\n]*)',                  # Item field
-        ]
+        # Primary pattern is usually the Name: pattern
+        core_patterns = [re.compile(primary_pattern, re.MULTILINE)] + _CORE_BOUNDARY_PATTERNS
         
         best_matches = []
         best_count = 0
         
         for pattern in core_patterns:
-            matches = list(re.finditer(pattern, content, re.MULTILINE))
+            matches = list(pattern.finditer(content))
             if len(matches) > best_count:
                 best_matches = matches
                 best_count = len(matches)
         
-        return best_matches
+        return [
+            _ProductBoundary(
+                start=match.start(),
+                name=match.group(1).strip() if len(match.groups()) > 0 else "Unknown",
+                marker=match.group()
+            )
+            for match in best_matches
+        ]
     
-    def _fallback_boundary_detection(self, content: str) -> List[re.Match]:
+    def _fallback_boundary_detection(self, content: str) -> List[_ProductBoundary]:
         """
         Fallback boundary detection using empty lines and field repetition.
         """
-        # Split by empty lines and find which sections have product-like patterns
-        sections = re.split(r'\n\s*\n', content)
-        boundaries = []
+        # Find the sections between empty lines, keeping their offsets
+        section_spans = []
+        previous_end = 0
+        for separator in _BLANK_LINE_SEPARATOR_RE.finditer(content):
+            section_spans.append((previous_end, separator.start()))
+            previous_end = separator.end()
+        section_spans.append((previous_end, len(content)))
         
-        # Pattern to detect any field: value structure
-        field_pattern = r'(?i)^([a-zA-Z][a-zA-Z\s]*?):\s*([^\n]*)'
+        boundaries = []
         
-        current_pos = 0
-        for section in sections:
-            section = section.strip()
-            if not section:
-                current_pos += 2  # Account for the newlines
+        for section_start, section_end in section_spans:
+            section_start, section_end = strip_span(content, section_start, section_end)
+            if section_start == section_end:
                 continue
             
-            # Check if section has field: value patterns
-            field_matches = re.findall(field_pattern, section, re.MULTILINE)
-            
-            if len(field_matches) >= 1:  # At least one field found
-                # Create a fake match at the start of this section
-                section_start = content.find(section, current_pos)
-                if section_start >= 0:
-                    # Create a match object-like tuple
-                    match = type('Match', (), {
-                        'start': lambda: section_start,
-                        'end': lambda: section_start + len(section),
-                        'group': lambda x=0: section[:50] if x == 0 else section[:50]
-                    })()
-                    boundaries.append(match)
+            section = content[section_start:section_end]
             
-            current_pos += len(section) + 2
+            # Check if section has field: value patterns
+            if _FIELD_LINE_RE.search(section):
+                boundaries.append(_ProductBoundary(section_start, "Unknown", section[:50]))
         
         return boundaries
\ No newline at end of file
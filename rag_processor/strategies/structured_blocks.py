@@ -16,6 +16,11 @@ from ..clients.base import ClientConfig
 from config.constants import DEFAULT_CHUNK_OVERLAP
 
 
+_EMPTY_LINE_SEPARATOR_RE = re.compile(r'\n\s*\n')
+# Lines of the form 'Field: value'
+_FIELD_LINE_RE = re.compile(r'^([a-zA-Z][a-zA-Z\s]*?):\s*([^\n]*)', re.MULTILINE)
+
+
 class StructuredBlocksStrategy(ProcessingStrategy):
     """
     Base class for structured block processing strategies.
@@ -37,26 +42,6 @@ class StructuredBlocksStrategy(ProcessingStrategy):
         """Regex pattern to detect block separators."""
         pass
     
-    @property
-    def name(self) -> str:
-        """Strategy name in format 'structured-blocks/separator-type'."""
-        return f"structured-blocks/{self.separator_type}"
-    
-    @property
-    def description(self) -> str:
-        """Human-readable description of the strategy."""
-        return f"Structured block chunking using {self.separator_type} separators"
-    
-    @property
-    def default_chunk_pattern(self) -> str:
-        """Default pattern is the separator pattern."""
-        return self.separator_pattern
-    
-    @property
-    def default_overlap(self) -> int:
-        """Default character overlap between chunks."""
-        return 0  # No overlap for block separation
-    
     def process(
         self, 
         content: str, 
@@ -220,7 +205,7 @@ class StructuredBlocksStrategy(ProcessingStrategy):
         # Use the separator pattern to split content
         if self.separator_type == "empty-line":
             # Split by double newlines (empty lines)
-            blocks = re.split(r'\n\s*\n', content)
+            blocks = _EMPTY_LINE_SEPARATOR_RE.split(content)
         else:
             # For other separators, split by the pattern
             blocks = re.split(pattern, content, flags=re.MULTILINE)
@@ -237,8 +222,7 @@ class StructuredBlocksStrategy(ProcessingStrategy):
         
         # Check minimum fields requirement
         if min_fields:
-            field_pattern = r'^([a-zA-Z][a-zA-Z\s]*?):\s*([^\n]*)'
-            field_matches = re.findall(field_pattern, block_text, re.MULTILINE)
+            field_matches = _FIELD_LINE_RE.findall(block_text)
             if len(field_matches) < min_fields:
                 return False
         
@@ -253,8 +237,7 @@ class StructuredBlocksStrategy(ProcessingStrategy):
         }
         
         # Extract field: value patterns
-        field_pattern = r'^([a-zA-Z][a-zA-Z\s]*?):\s*([^\n]*)'
-        field_matches = re.findall(field_pattern, block_text, re.MULTILINE)
+        field_matches = _FIELD_LINE_RE.findall(block_text)
         
         if field_matches:
             metadata["fields"] = [field[0].strip() for field in field_matches]
@@ -295,6 +278,11 @@ class EmptyLineSeparatedStrategy(StructuredBlocksStrategy):
     Universal and foolproof - works with any structured data.
     """
     
+    name = "structured-blocks/empty-line-separated"
+    description = "Structured block chunking using empty-line-separated separators"
+    default_chunk_pattern = r'\n\s*\n'
+    default_overlap = 0  # No overlap for block separation
+    
     @property
     def separator_type(self) -> str:
         """Type of separator used."""
@@ -338,6 +326,11 @@ class HeadingSeparatedStrategy(StructuredBlocksStrategy):
     Perfect for documentation and hierarchical content.
     """
     
+    name = "structured-blocks/heading-separated"
+    description = "Structured block chunking using heading-separated separators"
+    default_chunk_pattern = r'^#{1,6}\s+.+$'
+    default_overlap = 0  # No overlap for block separation
+    
     @property
     def separator_type(self) -> str:
         """Type of separator used."""
@@ -414,6 +407,11 @@ class NumberedSeparatedStrategy(StructuredBlocksStrategy):
     Perfect for step-by-step instructions and ordered content.
     """
     
+    name = "structured-blocks/numbered-separated"
+    description = "Structured block chunking using numbered-separated separators"
+    default_chunk_pattern = r'^\d+\.\s+'
+    default_overlap = 0  # No overlap for block separation
+    
     @property
     def separator_type(self) -> str:
         """Type of separator used."""
@@ -1,10 +1,11 @@
 """Utility functions and helpers."""
 
 from .directive_parser import DirectiveParser
-from .text_utils import TextChunker, ChunkMetadata
+from .text_utils import TextChunker, ChunkMetadata, LazyChunkMetadata
 
 __all__ = [
     "DirectiveParser",
     "TextChunker",
     "ChunkMetadata",
+    "LazyChunkMetadata",
 ]
\ No newline at end of file
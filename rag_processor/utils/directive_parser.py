@@ -12,6 +12,14 @@ from dataclasses import dataclass
 from config.constants import ERROR_INVALID_DIRECTIVE
 
 
+# Core directive patterns, tried in order on each directive line
+_DIRECTIVE_PATTERNS = {
+    'strategy': re.compile(r'@strategy:\s*(.+)'),
+    'source_url': re.compile(r'@source-url:\s*(.+)'),
+    'metadata': re.compile(r'@metadata:\s*(.+)'),
+}
+
+
 @dataclass
 class ProcessingDirective:
     """Parsed processing directive from .rag file header."""
@@ -35,11 +43,7 @@ class DirectiveParser:
     
     def __init__(self):
         """Initialize parser with core directive patterns."""
-        self.directive_patterns = {
-            'strategy': r'@strategy:\s*(.+)',
-            'source_url': r'@source-url:\s*(.+)',
-            'metadata': r'@metadata:\s*(.+)',
-        }
+        self.directive_patterns = dict(_DIRECTIVE_PATTERNS)
     
     def parse(self, content: str) -> ProcessingDirective:
         """
@@ -70,7 +74,7 @@ class DirectiveParser:
             
             # Parse each directive type
             for directive_type, pattern in self.directive_patterns.items():
-                match = re.match(pattern, line)
+                match = pattern.match(line)
                 if match:
                     value = match.group(1).strip()
                     
@@ -5,14 +5,55 @@ Provides text chunking functionality and chunk metadata management.
 """
 
 import re
-from typing import List, Dict, Any, Optional, Tuple
-from dataclasses import dataclass
+from itertools import islice
+from typing import List, Dict, Any, Optional, Tuple, Callable, Iterable
+from dataclasses import dataclass, field
 
 from config.constants import (
     MINIMUM_CHUNK_SIZE, MAXIMUM_CHUNK_SIZE, DEFAULT_CHUNK_OVERLAP
 )
 
 
+def strip_span(text: str, start: int, end: int) -> Tuple[int, int]:
+    """
+    Narrow a span so it excludes leading and trailing whitespace.
+
+    Equivalent to ``text[start:end].strip()`` but returns offsets instead
+    of allocating the stripped substring.
+
+    Args:
+        text (str): Text the span refers to
+        start (int): Span start offset
+        end (int): Span end offset
+
+    Returns:
+        Tuple[int, int]: Stripped (start, end) offsets; start == end if the
+            span is empty or whitespace only
+    """
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return start, end
+
+
+def at_least(items: Iterable[Any], count: int) -> bool:
+    """
+    Check whether an iterable yields at least count items.
+
+    Consumes no more than count items, so threshold checks over a lazy
+    ``finditer`` stop scanning as soon as the answer is known.
+
+    Args:
+        items (Iterable[Any]): Items to count, typically regex matches
+        count (int): Required number of items
+
+    Returns:
+        bool: True if at least count items were yielded
+    """
+    return sum(1 for _ in islice(items, count)) >= count
+
+
 @dataclass
 class ChunkMetadata:
     """Metadata for a processed text chunk."""
@@ -33,6 +74,32 @@ class ChunkMetadata:
         return len(self.text.split())
 
 
+@dataclass
+class LazyChunkMetadata(ChunkMetadata):
+    """
+    Chunk whose metadata dict is built on first access.
+    
+    Consumers that only read the chunk text never pay for metadata
+    analysis. The factory must be picklable (e.g. a functools.partial of
+    a strategy method) so chunks can cross process boundaries. Copies made
+    with dataclasses.replace() keep the factory and build their own
+    metadata on first access.
+    """
+    
+    # Not set in __init__; __getattr__ fills it in on first access
+    metadata: Dict[str, Any] = field(init=False)
+    metadata_factory: Callable[[], Dict[str, Any]] = field(repr=False, compare=False)
+    
+    def __getattr__(self, name: str) -> Any:
+        """Build metadata the first time it is read."""
+        if name != "metadata":
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        
+        # Stored on the instance, so later reads skip __getattr__ entirely
+        self.metadata = self.metadata_factory()
+        return self.metadata
+
+
 class TextChunker:
     """
     Advanced text chunking utility with pattern-based boundaries.
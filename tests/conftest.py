@@ -130,6 +130,29 @@ Q: Is there a free trial available?
 A: Yes, the basic version is open source and available for free. Enterprise features require a license."""
 
 
+@pytest.fixture
+def sample_article():
+    """Sample article content for testing."""
+    return "First sentence here. Second sentence follows.\n\nAnother paragraph with \"a quote\"."
+
+
+@pytest.fixture
+def sample_api_docs():
+    """Sample API documentation content for testing."""
+    return """## Overview
+
+Functions for managing users through the API.
+
+### def create_user(name, email)
+
+Creates a new user. **Returns:** the user object.
+
+```python
+user = create_user("Jane", "jane@example.com")
+```
+"""
+
+
 @pytest.fixture
 def sample_rag_file():
     """Sample .rag file content for testing."""
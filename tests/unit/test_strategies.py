@@ -4,15 +4,25 @@ Unit tests for processing strategies.
 Tests all 6 core processing strategies for proper chunking behavior.
 """
 
+import dataclasses
+
 import pytest
 from rag_processor.strategies import (
-    ProductsStrategy, ManualStrategy, FAQStrategy, 
+    ProcessingStrategy, ProductsStrategy, ManualStrategy, FAQStrategy, 
     ArticleStrategy, LegalStrategy, CodeStrategy
 )
 from rag_processor.utils.directive_parser import ProcessingDirective
+from rag_processor.utils.text_utils import LazyChunkMetadata
+from rag_processor.clients.default import DefaultConfig
 from tests.conftest import assert_chunk_quality, assert_metadata_complete
 
 
+class LazyMetadataConfig(DefaultConfig):
+    """Default configuration with lazy chunk metadata enabled."""
+    
+    lazy_metadata = True
+
+
 class TestProductsStrategy:
     """Test cases for ProductsStrategy."""
     
@@ -67,6 +77,23 @@ class TestProductsStrategy:
             # Should detect price in products
             if "Preço:" in chunk.text:
                 assert metadata["has_price"] is True
+    
+    def test_products_strategy_fallback_boundaries(self, default_config):
+        """Test products without name fields are split at empty lines."""
+        content = "\n\n".join(
+            f"Color: red {i}\nSize: large\nNotes: handmade piece number {i} from the spring collection"
+            for i in range(3)
+        )
+        
+        strategy = ProductsStrategy()
+        directive = ProcessingDirective()
+        
+        chunks = strategy.process(content, directive, default_config)
+        
+        assert len(chunks) == 3
+        for i, chunk in enumerate(chunks):
+            assert chunk.text.startswith(f"Color: red {i}")
+            assert content[chunk.start_position:].startswith(chunk.text)
 
 
 class TestManualStrategy:
@@ -114,6 +141,28 @@ class TestManualStrategy:
         levels = [chunk.metadata["section_level"] for chunk in chunks]
         assert min(levels) == 1  # Main section
         assert max(levels) >= 2  # Subsections
+    
+    def test_manual_strategy_parent_sections(self, default_config):
+        """Test manual strategy links sections to parents and counts subsections."""
+        body = "Follow each step of this procedure carefully before moving on to the next one.\n\n" * 2
+        content = (
+            "# Guide\n\n" + body +
+            "## Setup\n\n" + body +
+            "### Install\n\n" + body +
+            "###### Footnote\n\n" + body
+        )
+        
+        strategy = ManualStrategy()
+        directive = ProcessingDirective()
+        
+        chunks = strategy.process(content, directive, default_config)
+        sections = {chunk.metadata["section_title"]: chunk.metadata for chunk in chunks}
+        
+        assert sections["Guide"]["parent_section"] is None
+        assert sections["Setup"]["parent_section"] == "Guide"
+        assert sections["Install"]["parent_section"] == "Setup"
+        assert sections["Footnote"]["section_level"] == 6
+        assert all(metadata["subsection_count"] == 0 for metadata in sections.values())
 
 
 class TestFAQStrategy:
@@ -160,6 +209,38 @@ class TestFAQStrategy:
         assert "procedure" in question_types   # How questions
         assert "explanation" in question_types # Why questions
         assert "timing" in question_types      # When questions
+    
+    def test_faq_strategy_answers_containing_q(self, default_config):
+        """Test Q&A pairs are kept when their text contains the letter q."""
+        content = """
+        Q: How do I get started quickly?
+        A: Install the package and follow the quick start guide for your platform.
+        
+        Q: Which formula: should I use for pricing?
+        A: Use the standard quote calculator available on the pricing page.
+        """
+        
+        strategy = FAQStrategy()
+        directive = ProcessingDirective()
+        
+        chunks = strategy.process(content, directive, default_config)
+        
+        assert len(chunks) == 2
+        assert "quick start guide" in chunks[0].text
+        assert chunks[1].metadata["question"] == "Which formula: should I use for pricing?"
+        assert "quote calculator" in chunks[1].text
+    
+    def test_faq_analysis_cache_returns_fresh_metadata(self):
+        """Test repeated Q&A analysis is not affected by mutating earlier results."""
+        strategy = FAQStrategy()
+        
+        first = strategy._analyze_qa_pair("Q: How do I contact support?", "A: Email us.")
+        first["topics"].append("mutated")
+        first["difficulty"] = "mutated"
+        second = strategy._analyze_qa_pair("Q: How do I contact support?", "A: Email us.")
+        
+        assert "mutated" not in second["topics"]
+        assert second["difficulty"] == "basic"
 
 
 class TestArticleStrategy:
@@ -208,6 +289,21 @@ class TestArticleStrategy:
             text = chunk.text.strip()
             # Should end with sentence terminator
             assert text.endswith('.') or text.endswith('!') or text.endswith('?')
+    
+    def test_article_process_batch_matches_serial(self, default_config):
+        """Test batch processing returns the same chunks as serial processing."""
+        contents = [
+            f"First sentence of document {i}. Second sentence follows here.\n\nAnother paragraph."
+            for i in range(4)
+        ]
+        
+        strategy = ArticleStrategy()
+        directive = ProcessingDirective()
+        
+        batched = strategy.process_batch(contents, directive, default_config, workers=2)
+        serial = [strategy.process(content, directive, default_config) for content in contents]
+        
+        assert batched == serial
 
 
 class TestLegalStrategy:
@@ -260,6 +356,36 @@ class TestLegalStrategy:
         # Should detect legal structure
         section_titles = [chunk.metadata.get("section_title", "") for chunk in chunks]
         assert any("Article" in title for title in section_titles)
+    
+    def test_legal_paragraph_chunk_positions(self, default_config):
+        """Test paragraph chunk positions point at the chunk text in the content."""
+        content = "\n   \n".join(
+            f"    The party shall observe provision {i} of this policy. " * 8 for i in range(10)
+        )
+        
+        strategy = LegalStrategy()
+        
+        chunks = strategy._process_paragraphs(content, overlap=0)
+        
+        assert len(chunks) > 1
+        for chunk in chunks:
+            span = content[chunk.start_position:chunk.end_position]
+            paragraphs = chunk.text.split("\n\n")
+            assert span.startswith(paragraphs[0])
+            assert span.endswith(paragraphs[-1])
+    
+    def test_legal_analysis_cache_returns_fresh_metadata(self):
+        """Test repeated legal analysis is not affected by earlier section types."""
+        strategy = LegalStrategy()
+        text = "Article 4 - Fees\nEach party shall pay the fee of $100 within 30 days of invoice, as set out in the order form."
+        section = strategy._extract_legal_sections(text)[0]
+        
+        with_section = strategy._analyze_legal_content(text, section)
+        without_section = strategy._analyze_legal_content(text)
+        
+        assert with_section["section_type"] == "payment"
+        assert "section_type" not in without_section
+        assert without_section["has_monetary_amounts"] is True
 
 
 class TestCodeStrategy:
@@ -336,6 +462,42 @@ class TestCodeStrategy:
         assert any(element_type in ["function", "class", "section"] for element_type in element_types)
 
 
+class TestLazyMetadata:
+    """Test lazily built chunk metadata."""
+    
+    @pytest.mark.parametrize("strategy_class,content_fixture", [
+        (ProductsStrategy, "sample_product_catalog"),
+        (ManualStrategy, "sample_user_manual"),
+        (FAQStrategy, "sample_faq"),
+        (ArticleStrategy, "sample_article"),
+        (CodeStrategy, "sample_api_docs"),
+    ])
+    def test_lazy_metadata_matches_eager(self, strategy_class, content_fixture, default_config, request):
+        """Test lazily built metadata matches eagerly built metadata."""
+        content = request.getfixturevalue(content_fixture)
+        strategy = strategy_class()
+        directive = ProcessingDirective()
+        
+        eager = strategy.process(content, directive, default_config)
+        lazy = strategy.process(content, directive, LazyMetadataConfig())
+        
+        assert eager
+        assert all(isinstance(chunk, LazyChunkMetadata) for chunk in lazy)
+        assert [chunk.text for chunk in lazy] == [chunk.text for chunk in eager]
+        assert [chunk.metadata for chunk in lazy] == [chunk.metadata for chunk in eager]
+    
+    def test_lazy_chunk_replace(self, sample_product_catalog):
+        """Test dataclasses.replace keeps a lazy chunk's metadata factory."""
+        strategy = ProductsStrategy()
+        chunk = strategy.process(sample_product_catalog, ProcessingDirective(), LazyMetadataConfig())[0]
+        
+        copy = dataclasses.replace(chunk, text=chunk.text.upper())
+        
+        assert isinstance(copy, LazyChunkMetadata)
+        assert copy.text == chunk.text.upper()
+        assert copy.metadata == chunk.metadata
+
+
 class TestStrategyValidation:
     """Test strategy validation methods."""
     
@@ -378,4 +540,30 @@ class TestStrategyValidation:
         invalid_issues = strategy.validate_content(invalid_content, directive)
         
         # Valid content should have fewer issues
-        assert len(valid_issues) <= len(invalid_issues)
\ No newline at end of file
+        assert len(valid_issues) <= len(invalid_issues)
+
+
+class TestStrategyClassAttributes:
+    """Test strategy identity class attributes."""
+    
+    def test_attributes_readable_on_class(self):
+        """Test strategy name and defaults are plain class attributes."""
+        assert ArticleStrategy.name == "article/sentence-based"
+        assert ArticleStrategy.default_overlap == ArticleStrategy().default_overlap
+    
+    def test_missing_attributes_rejected(self):
+        """Test concrete strategies must define the required attributes."""
+        with pytest.raises(TypeError, match="default_overlap"):
+            class IncompleteStrategy(ProcessingStrategy):
+                name = "incomplete/test"
+                description = "Missing overlap"
+                default_chunk_pattern = r'\n'
+                
+                def process(self, content, directive, client_config):
+                    return []
+                
+                def validate_content(self, content, directive):
+                    return []
+                
+                def create_template(self, client_config):
+                    return ""